@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Compare per-utterance waveform augmentation with BatchAugment on whole batches.
+Usage:
+  python benchmarks/augment.py
+  python benchmarks/augment.py --batch_sizes 8 32 64 --chunk_duration 4.0 --device cuda
+
+The per-utterance path is what a DataLoader-side augmentation costs: each
+crop goes through SpeechBrain's SpeedPerturb and AddNoise plus a random gain
+on its own. The batched path runs BatchAugment (the same speeds, gain and
+SNR range) once on the padded ``[batch, time]`` tensor that compute_forward
+sees. Times are medians per batch.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+from speechbrain.processing.speech_augmentation import AddNoise, SpeedPerturb
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from parkinsons_speech.augment import BatchAugment  # noqa: E402
+
+
+def per_item(speed, noise, gain_db, wavs, lens):
+    out = []
+    for wav, rel in zip(wavs, lens):
+        wav = speed(wav.unsqueeze(0))
+        wav = wav * 10 ** ((torch.rand(1, device=wav.device) * 2 - 1) * gain_db / 20)
+        out.append(noise(wav, rel.unsqueeze(0)).squeeze(0))
+    return out
+
+
+def median_ms(fn, runs: int, device: str) -> float:
+    fn()
+    times = []
+    for _ in range(runs):
+        if device.startswith("cuda"):
+            torch.cuda.synchronize()
+        start = time.perf_counter()
+        fn()
+        if device.startswith("cuda"):
+            torch.cuda.synchronize()
+        times.append(time.perf_counter() - start)
+    return 1000 * statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-utterance vs batched waveform augmentation.")
+    parser.add_argument("--batch_sizes", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--chunk_duration", type=float, default=3.0, help="Seconds per training crop.")
+    parser.add_argument("--sample_rate", type=int, default=16000)
+    parser.add_argument("--speeds", type=int, nargs="+", default=[90, 100, 110])
+    parser.add_argument("--snr_low", type=float, default=10.0)
+    parser.add_argument("--snr_high", type=float, default=20.0)
+    parser.add_argument("--gain_db", type=float, default=6.0)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    speed = SpeedPerturb(orig_freq=args.sample_rate, speeds=args.speeds).to(args.device)
+    noise = AddNoise(snr_low=args.snr_low, snr_high=args.snr_high).to(args.device)
+    batched = BatchAugment(args.speeds, args.snr_low, args.snr_high, args.gain_db).to(args.device)
+    num_samples = int(args.sample_rate * args.chunk_duration)
+
+    results = []
+    with torch.no_grad():
+        for batch_size in args.batch_sizes:
+            wavs = 0.1 * torch.randn(batch_size, num_samples, device=args.device)
+            # Some shorter recordings, as in a padded batch of real crops.
+            lens = torch.ones(batch_size, device=args.device)
+            lens[::4] = 0.6
+            row = {
+                "batch_size": batch_size,
+                "per_item_ms": median_ms(
+                    lambda: per_item(speed, noise, args.gain_db, wavs, lens), args.runs, args.device
+                ),
+                "batched_ms": median_ms(lambda: batched(wavs, lens), args.runs, args.device),
+            }
+            row["speedup"] = row["per_item_ms"] / max(row["batched_ms"], 1e-9)
+            results.append(row)
+            print(f"batch {batch_size:4d}  per-item {row['per_item_ms']:9.2f} ms  "
+                  f"batched {row['batched_ms']:9.2f} ms  x{row['speedup']:.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Guard CLI startup cost with ``python -X importtime``.
+Usage:
+  python benchmarks/import_time.py                 # check every script's --help against the budget
+  python benchmarks/import_time.py --budget_ms 300 --output import_time.json
+
+Each command runs in a fresh interpreter with -X importtime. The import
+log is parsed into per-module cumulative times; the command fails the
+check when its total import time exceeds the budget or when it imports a
+heavy dependency (torch, speechbrain, ...) that --help should never need.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+COMMANDS = [
+    ["scripts/prepare_manifests.py", "--help"],
+    ["scripts/cache_audio.py", "--help"],
+    ["scripts/predict.py", "--help"],
+    ["scripts/serve.py", "--help"],
+    ["scripts/client.py", "--help"],
+    ["scripts/load_test.py", "--help"],
+    ["scripts/sweep.py", "--help"],
+    ["scripts/cross_validate.py", "--help"],
+    ["scripts/export_quantized.py", "--help"],
+    ["scripts/export_torchscript.py", "--help"],
+    ["scripts/stream_replay.py", "--help"],
+]
+HEAVY_MODULES = ("torch", "torchaudio", "speechbrain", "sklearn", "hyperpyyaml", "numpy", "scipy")
+
+
+def parse_importtime(stderr: str):
+    """
+    ``(module, self_us, cumulative_us, depth)`` rows from -X importtime output.
+
+    Lines look like ``import time:  self [us] | cumulative | imported package``;
+    nesting is encoded as two spaces of indentation per level in the last column.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def measure(cmd, repeats: int):
+    """Total top-level import time (median over ``repeats``) and the last run's rows."""
+    totals = []
+    rows = []
+    for _ in range(repeats):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *cmd],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{' '.join(cmd)} failed:\n{proc.stderr[-2000:]}")
+        rows = parse_importtime(proc.stderr)
+        totals.append(sum(cumulative for _, _, cumulative, depth in rows if depth == 0))
+    return statistics.median(totals) / 1000, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check CLI import time against a budget.")
+    parser.add_argument("--budget_ms", type=float, default=250.0, help="Allowed import time per command.")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per command; the median is reported.")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to list per command.")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    results = []
+    failed = False
+    for cmd in COMMANDS:
+        total_ms, rows = measure(cmd, args.repeats)
+        imported = {name.split(".")[0] for name, _, _, _ in rows}
+        heavy = sorted(imported & set(HEAVY_MODULES))
+        slowest = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)[: args.top]
+        ok = total_ms <= args.budget_ms and not heavy
+        failed |= not ok
+        results.append(
+            {
+                "command": " ".join(cmd),
+                "import_ms": round(total_ms, 1),
+                "heavy_imports": heavy,
+                "slowest": [{"module": name, "cumulative_ms": round(cum / 1000, 1)} for name, _, cum, _ in slowest],
+                "ok": ok,
+            }
+        )
+        flag = "ok  " if ok else "FAIL"
+        extra = f" heavy={','.join(heavy)}" if heavy else ""
+        print(f"{flag} {total_ms:8.1f} ms  {' '.join(cmd)}{extra}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"budget_ms": args.budget_ms, "results": results}, f, indent=2)
+    if failed:
+        sys.exit(f"Import-time budget of {args.budget_ms:.0f} ms exceeded or heavy modules imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Compare float32 and bf16-autocast training for every encoder family.
+Usage:
+  python benchmarks/precision.py --models xvector ecapa_tdnn wav2vec2 --steps 20
+  python benchmarks/precision.py --models xvector --train --data_root data/raw/italian_parkinson
+
+Step time is measured on synthetic batches of chunk_duration audio
+(forward, backward and optimizer step). With --train each model is also
+trained end to end per precision through the sweep scheduler and the final
+test error_rate is read from its train log.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+from hyperpyyaml import load_hyperpyyaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from parkinsons_speech.encoders import get_family  # noqa: E402
+from parkinsons_speech.precision import AUTOCAST_DTYPES, autocast, resolve_precision  # noqa: E402
+from parkinsons_speech.sweep import make_jobs, run_sweep  # noqa: E402
+from parkinsons_speech.utils import available_cpus, available_memory_gb  # noqa: E402
+
+RECIPES_DIR = ROOT / "recipes" / "parkinsons_binary"
+
+
+def step_times(model: str, precision: str, steps: int, batch_size: int, warmup: int = 2):
+    with open(RECIPES_DIR / model / "hparams" / "train.yaml") as fin:
+        hparams = load_hyperpyyaml(fin, {"data_folder": "unused"})
+    family = get_family(hparams)
+    modules = hparams["modules"]
+    for module in modules.values():
+        module.train()
+    params = [p for module in modules.values() for p in module.parameters() if p.requires_grad]
+    optimizer = hparams["opt_class"](params)
+    dtype = resolve_precision(precision, "cpu")
+
+    n_samples = int(hparams["sample_rate"] * hparams["chunk_duration"])
+    wavs = torch.randn(batch_size, n_samples) * 0.1
+    lens = torch.ones(batch_size)
+    labels = torch.randint(0, hparams["n_classes"], (batch_size, 1))
+
+    times = []
+    for step in range(warmup + steps):
+        start = time.perf_counter()
+        with autocast("cpu", dtype):
+            preds = family.classify_waveforms(modules, hparams, wavs, lens)
+        loss = family.compute_cost(hparams, preds.float(), labels, lens)
+        optimizer.zero_grad()
+        loss.backward()
+        optimizer.step()
+        if step >= warmup:
+            times.append(time.perf_counter() - start)
+    return {
+        "step_s_mean": round(statistics.fmean(times), 4),
+        "step_s_median": round(statistics.median(times), 4),
+        "autocast": str(dtype) if dtype is not None else "none",
+    }
+
+
+def train_error_rates(args, precisions):
+    jobs = []
+    for precision in precisions:
+        jobs.extend(
+            make_jobs(
+                RECIPES_DIR,
+                args.models,
+                [args.seed],
+                Path(args.output_root) / precision,
+                job_memory_gb={},
+                label=precision,
+                extra_args=["--precision", precision],
+            )
+        )
+    run_sweep(
+        jobs,
+        data_folder=args.data_root,
+        log_dir=Path(args.output_root) / "sweep_logs",
+        total_threads=args.threads,
+        threads_per_job=args.threads_per_job,
+        memory_gb=round(0.9 * available_memory_gb(), 1),
+    )
+    return {(job.label, job.model): job.metrics.get("test", {}).get("error_rate") for job in jobs}
+
+
+def main():
+    all_models = sorted(p.parent.parent.name for p in RECIPES_DIR.glob("*/hparams/train.yaml"))
+    parser = argparse.ArgumentParser(description="Benchmark fp32 vs bf16 autocast training.")
+    parser.add_argument("--models", nargs="+", default=all_models, choices=all_models)
+    parser.add_argument("--precisions", nargs="+", default=list(AUTOCAST_DTYPES), choices=list(AUTOCAST_DTYPES))
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=available_cpus(), help="torch threads for step timing.")
+    parser.add_argument("--train", action="store_true", help="Also train each model per precision.")
+    parser.add_argument("--data_root", default=None, help="Raw data root (required with --train).")
+    parser.add_argument("--seed", type=int, default=1986)
+    parser.add_argument("--threads_per_job", type=int, default=4)
+    parser.add_argument("--output_root", default="results/precision")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results.")
+    args = parser.parse_args()
+    if args.train and not args.data_root:
+        parser.error("--train requires --data_root")
+
+    torch.set_num_threads(args.threads)
+    results = []
+    for model in args.models:
+        for precision in args.precisions:
+            row = {"model": model, "precision": precision, **step_times(model, precision, args.steps, args.batch_size)}
+            results.append(row)
+            print(json.dumps(row))
+
+    if args.train:
+        errors = train_error_rates(args, args.precisions)
+        for row in results:
+            row["test_error_rate"] = errors.get((row["precision"], row["model"]))
+
+    baseline = {r["model"]: r["step_s_mean"] for r in results if r["precision"] == "fp32"}
+    print(f"\n{'model':<12} {'precision':<9} {'step_s':>8} {'speedup':>8} {'test_error':>10}")
+    for row in results:
+        speedup = baseline.get(row["model"], row["step_s_mean"]) / row["step_s_mean"]
+        error = row.get("test_error_rate")
+        print(
+            f"{row['model']:<12} {row['precision']:<9} {row['step_s_mean']:>8.4f} {speedup:>8.2f} "
+            f"{'' if error is None else f'{error:.4f}':>10}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Time manifest split preparation on a large synthetic corpus.
+Usage:
+  python benchmarks/record_table.py                      # 1M records, 5000 speakers
+  python benchmarks/record_table.py --records 200000 --speakers 2000 --output record_table.json
+
+Compares the list-of-Records implementation the split code used before
+(per-speaker dict grouping, Python loops for summaries and set-based overlap
+checks) with the vectorized RecordTable path: building the table, the
+speaker-level split, summarize_split and speaker_overlap. The
+duration-balanced split is timed on the table alone. Peak traced
+memory of holding the records is reported for both representations.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from parkinsons_speech import data_prep  # noqa: E402
+from parkinsons_speech.data_prep import Record  # noqa: E402
+from parkinsons_speech.records import RecordTable  # noqa: E402
+
+SPLIT_NAMES = ("train", "valid", "test")
+
+
+def synthetic_records(n_records: int, n_speakers: int, seed: int):
+    rng = random.Random(seed)
+    labels = {f"spk{s:05d}": ("parkinson" if s % 2 else "not_parkinson") for s in range(n_speakers)}
+    speakers = list(labels)
+    for i in range(n_records):
+        speaker = speakers[rng.randrange(n_speakers)]
+        yield Record(
+            utt_id=f"utt{i:08d}",
+            wav=f"{{data_root}}/{speaker}/utt{i:08d}.wav",
+            speaker=speaker,
+            label=labels[speaker],
+            duration=rng.uniform(1.0, 30.0),
+        )
+
+
+def legacy_split(records, val_ratio, test_ratio, seed):
+    """The list-based speaker split, kept here as the reference."""
+    from sklearn.model_selection import train_test_split
+
+    grouped = {}
+    for rec in records:
+        grouped.setdefault(rec.speaker, []).append(rec)
+    speakers = sorted(grouped)
+    speaker_labels = []
+    for s in speakers:
+        labels = {r.label for r in grouped[s]}
+        if len(labels) != 1:
+            raise ValueError(f"Mixed labels for speaker: {labels}")
+        speaker_labels.append(labels.pop())
+    label_of = dict(zip(speakers, speaker_labels))
+    train_spk, test_spk = train_test_split(
+        speakers, test_size=test_ratio, stratify=speaker_labels, random_state=seed
+    )
+    train_spk, val_spk = train_test_split(
+        train_spk,
+        test_size=val_ratio / (1 - test_ratio),
+        stratify=[label_of[s] for s in train_spk],
+        random_state=seed,
+    )
+    splits = {"train": train_spk, "valid": val_spk, "test": test_spk}
+    return {name: [r for s in spk for r in grouped[s]] for name, spk in splits.items()}
+
+
+def legacy_summary(split):
+    summary = {}
+    for name, recs in split.items():
+        labels = {}
+        speakers = set()
+        for r in recs:
+            labels[r.label] = labels.get(r.label, 0) + 1
+            speakers.add(r.speaker)
+        summary[name] = {"examples": len(recs), "speakers": len(speakers), **labels}
+    return summary
+
+
+def legacy_overlap(split):
+    for a in SPLIT_NAMES:
+        for b in SPLIT_NAMES:
+            if a < b:
+                assert set(r.speaker for r in split[a]).isdisjoint(set(r.speaker for r in split[b]))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def traced_peak_mb(fn):
+    tracemalloc.start()
+    out = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return out, peak / 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list-based vs columnar split preparation.")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--speakers", type=int, default=5000)
+    parser.add_argument("--val_ratio", type=float, default=0.1)
+    parser.add_argument("--test_ratio", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--skip_memory", action="store_true", help="Skip the (slow) tracemalloc pass.")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    def make_list():
+        return list(synthetic_records(args.records, args.speakers, args.seed))
+
+    def make_table():
+        return RecordTable.from_records(synthetic_records(args.records, args.speakers, args.seed))
+
+    results = {"records": args.records, "speakers": args.speakers}
+    if not args.skip_memory:
+        _, results["list_peak_mb"] = traced_peak_mb(make_list)
+        _, results["table_peak_mb"] = traced_peak_mb(make_table)
+
+    records, results["list_build_s"] = timed(make_list)
+    table, results["table_build_s"] = timed(RecordTable.from_records, records)
+
+    split_args = (args.val_ratio, args.test_ratio, args.seed)
+    legacy, results["list_split_s"] = timed(legacy_split, records, *split_args)
+    split, results["table_split_s"] = timed(data_prep.split_speaker_level, table, *split_args)
+    balanced, results["table_balanced_split_s"] = timed(data_prep.split_speaker_balanced, table, *split_args)
+    _, results["list_summary_s"] = timed(legacy_summary, legacy)
+    summary, results["table_summary_s"] = timed(data_prep.summarize_split, split)
+    _, results["list_overlap_s"] = timed(legacy_overlap, legacy)
+    overlap, results["table_overlap_s"] = timed(data_prep.speaker_overlap, split)
+
+    assert not any(overlap.values()), overlap
+    for name in SPLIT_NAMES:
+        assert summary[name]["examples"] == len(legacy[name]), name
+    results["summary"] = summary
+    results["balanced_summary"] = data_prep.summarize_split(balanced)
+
+    for step in ("split", "summary", "overlap"):
+        list_s, table_s = results[f"list_{step}_s"], results[f"table_{step}_s"]
+        print(f"{step:<8} list {list_s * 1000:9.1f} ms  table {table_s * 1000:9.1f} ms  "
+              f"x{list_s / max(table_s, 1e-9):.1f}")
+    print(f"balanced split {results['table_balanced_split_s'] * 1000:.1f} ms, hours per split: "
+          + ", ".join(f"{k}={v['hours']}" for k, v in results["balanced_summary"].items()))
+    if not args.skip_memory:
+        print(f"memory   list {results['list_peak_mb']:9.1f} MB  table {results['table_peak_mb']:9.1f} MB")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
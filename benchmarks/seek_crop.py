@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Check seek-based crop reads against the read-everything pipeline and time both.
+Usage:
+  python benchmarks/seek_crop.py
+  python benchmarks/seek_crop.py --min_duration 60 --max_duration 300 --model ecapa_tdnn
+
+Writes a synthetic corpus of long recordings (benchmarks/synthetic_corpus.py)
+and manifests for it, then builds the training dataset of a recipe twice,
+with ``seek_crop`` off and on. Every item is drawn under the same torch seed
+in both, so both paths pick the same crop window; the script fails if any
+crop differs by more than --tolerance. Reported times are the per-item
+read, resample and crop seconds from ``pipeline_timing``.
+"""
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import torch
+from hyperpyyaml import load_hyperpyyaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from synthetic_corpus import make_corpus  # noqa: E402
+
+from parkinsons_speech import data_prep  # noqa: E402
+from parkinsons_speech.dataio import dataio_prep  # noqa: E402
+from parkinsons_speech.records import RecordTable  # noqa: E402
+
+RECIPES_DIR = ROOT / "recipes" / "parkinsons_binary"
+
+
+def build_train_set(model: str, overrides, seek_crop: bool):
+    with open(RECIPES_DIR / model / "hparams" / "train.yaml") as fin:
+        hparams = load_hyperpyyaml(fin, {**overrides, "seek_crop": seek_crop, "profile": True})
+    Path(hparams["save_folder"]).mkdir(parents=True, exist_ok=True)
+    return dataio_prep(hparams)["train"]
+
+
+def draw(dataset, items: int):
+    """Crops and pipeline seconds per item, each item under its own seed."""
+    crops, seconds = [], []
+    for i in range(items):
+        torch.manual_seed(i)
+        item = dataset[i]
+        crops.append(item["sig"])
+        seconds.append(sum(item["pipeline_timing"].values()))
+    return crops, seconds
+
+
+def main():
+    models = sorted(p.parent.parent.name for p in RECIPES_DIR.glob("*/hparams/train.yaml"))
+    parser = argparse.ArgumentParser(description="Compare seek-based and full-read random crops.")
+    parser.add_argument("--work_dir", default=None, help="Corpus, manifests and runs (default: a temp dir).")
+    parser.add_argument("--model", default="xvector", choices=models, help="Recipe whose hparams are used.")
+    parser.add_argument("--speakers", type=int, default=6, help="Speakers per group.")
+    parser.add_argument("--files_per_speaker", type=int, default=2)
+    parser.add_argument("--min_duration", type=float, default=30.0, help="Seconds.")
+    parser.add_argument("--max_duration", type=float, default=120.0, help="Seconds.")
+    parser.add_argument("--items", type=int, default=32, help="Training items compared.")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Max absolute sample difference.")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results.")
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="pd_seek_"))
+    corpus, manifest_dir = work_dir / "corpus", work_dir / "manifests"
+    make_corpus(
+        corpus,
+        args.speakers,
+        args.speakers,
+        args.speakers,
+        args.files_per_speaker,
+        args.min_duration,
+        args.max_duration,
+    )
+    table = RecordTable.from_records(data_prep.scan_dataset(corpus))
+    for name, split in data_prep.split_speaker_level(table, 0.2, 0.2, 1234).items():
+        data_prep.write_manifest(split.rows(), manifest_dir / f"{name}.json")
+    overrides = {
+        "data_folder": str(corpus),
+        "manifest_dir": str(manifest_dir),
+        "output_root": str(work_dir / "runs"),
+    }
+
+    full = build_train_set(args.model, overrides, seek_crop=False)
+    seek = build_train_set(args.model, overrides, seek_crop=True)
+    items = min(args.items, len(full))
+    full_crops, full_s = draw(full, items)
+    seek_crops, seek_s = draw(seek, items)
+
+    diffs = [
+        float((a - b).abs().max()) if a.shape == b.shape else float("inf")
+        for a, b in zip(full_crops, seek_crops)
+    ]
+    results = {
+        "items": items,
+        "max_abs_diff": max(diffs),
+        "full_ms_per_item": 1000 * sum(full_s) / items,
+        "seek_ms_per_item": 1000 * sum(seek_s) / items,
+    }
+    print(f"{items} crops, max abs diff {results['max_abs_diff']:.2e}")
+    print(f"full read {results['full_ms_per_item']:8.2f} ms/item  "
+          f"seek {results['seek_ms_per_item']:8.2f} ms/item  "
+          f"x{results['full_ms_per_item'] / max(results['seek_ms_per_item'], 1e-9):.1f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if results["max_abs_diff"] > args.tolerance:
+        sys.exit(f"seek_crop differs from the full-read crop by more than {args.tolerance}")
+
+
+if __name__ == "__main__":
+    main()
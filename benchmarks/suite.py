@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Offline CPU benchmark suite on a synthetic corpus.
+Usage:
+  python benchmarks/suite.py --output benchmarks/results/latest.json
+  python benchmarks/suite.py --output new.json --baseline benchmarks/results/baseline.json
+
+Generates a corpus with benchmarks/synthetic_corpus.py, then times
+scan_dataset, the split functions, manifest writing, each recipe's
+audio pipeline, one training epoch per recipe and inference.forward
+latency. Models are randomly initialised and shrunk with top-level
+overrides (TINY_OVERRIDES), so nothing is downloaded. The SSL recipes need
+their hub weights and are only run when passed with --models.
+
+All metrics are times (lower is better). With --baseline every metric is
+compared with the stored run and the suite exits nonzero when one is slower
+than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+from hyperpyyaml import load_hyperpyyaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from synthetic_corpus import make_corpus  # noqa: E402
+
+from parkinsons_speech import data_prep  # noqa: E402
+from parkinsons_speech.dataio import dataio_prep  # noqa: E402
+from parkinsons_speech.inference import forward  # noqa: E402
+from parkinsons_speech.records import RecordTable  # noqa: E402
+from parkinsons_speech.sweep import job_command, make_jobs, parse_train_log  # noqa: E402
+
+RECIPES_DIR = ROOT / "recipes" / "parkinsons_binary"
+DEFAULT_MODELS = ["xvector", "ecapa_tdnn"]
+# Short crops, small batches and one epoch keep every recipe in seconds on a laptop.
+COMMON_OVERRIDES = {"chunk_duration": 2.0, "batch_size": 4, "number_of_epochs": 1}
+TINY_OVERRIDES = {
+    "xvector": {"emb_dim": 32, "n_fea": 24},
+    "ecapa_tdnn": {"n_mels": 24},
+}
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+
+def model_overrides(model: str, corpus: Path, manifest_dir: Path, run_root: Path):
+    return {
+        "data_folder": str(corpus),
+        "manifest_dir": str(manifest_dir),
+        "output_root": str(run_root),
+        **COMMON_OVERRIDES,
+        **TINY_OVERRIDES.get(model, {}),
+    }
+
+
+def bench_data_prep(corpus: Path, manifest_dir: Path, workers: int, metrics) -> None:
+    records, metrics["scan_dataset_s"] = timed(
+        lambda: list(data_prep.scan_dataset(corpus, workers=workers))
+    )
+    table, metrics["record_table_s"] = timed(RecordTable.from_records, records)
+    args = (0.1, 0.2, 1234)
+    split, metrics["split_speaker_level_s"] = timed(data_prep.split_speaker_level, table, *args)
+    _, metrics["split_speaker_balanced_s"] = timed(data_prep.split_speaker_balanced, table, *args)
+    _, metrics["split_file_level_s"] = timed(data_prep.split_file_level, table, *args)
+
+    manifests = {name: dict(t.rows()) for name, t in split.items()}
+    start = time.perf_counter()
+    for name, manifest in manifests.items():
+        data_prep.save_manifest(manifest, manifest_dir / f"{name}.json")
+    metrics["save_manifest_json_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for name, t in split.items():
+        data_prep.write_manifest(t.rows(), manifest_dir / "jsonl" / f"{name}.jsonl")
+    metrics["write_manifest_jsonl_s"] = time.perf_counter() - start
+
+
+def bench_model(model: str, overrides, items: int, runs: int, metrics) -> None:
+    """audio_pipeline cost per item and forward latency of a randomly initialised model."""
+    with open(RECIPES_DIR / model / "hparams" / "train.yaml") as fin:
+        hparams = load_hyperpyyaml(fin, overrides)
+    Path(hparams["save_folder"]).mkdir(parents=True, exist_ok=True)
+    dataset = dataio_prep(hparams)["train"]
+    n = min(items, len(dataset))
+    _, elapsed = timed(lambda: [dataset[i] for i in range(n)])
+    metrics[f"audio_pipeline_ms/{model}"] = 1000 * elapsed / n
+
+    modules = hparams["modules"]
+    for module in modules.values():
+        module.eval()
+    wav = torch.randn(1, int(hparams["sample_rate"] * hparams["chunk_duration"])) * 0.1
+    times = []
+    with torch.inference_mode():
+        forward(modules, hparams, wav)
+        for _ in range(runs):
+            _, elapsed = timed(forward, modules, hparams, wav)
+            times.append(elapsed)
+    metrics[f"predict_forward_ms/{model}"] = 1000 * statistics.median(times)
+
+
+def bench_training(model: str, overrides, corpus: Path, run_root: Path, threads: int, metrics) -> None:
+    """One epoch through the real train.py; epoch time comes from the train log's loader timing."""
+    job = make_jobs(RECIPES_DIR, [model], [1986], run_root, job_memory_gb={})[0]
+    # A finished run in a reused --work_dir would be recovered instead of trained.
+    shutil.rmtree(job.output_folder, ignore_errors=True)
+    extra = []
+    for key, value in overrides.items():
+        if key not in ("data_folder", "output_root"):
+            extra += [f"--{key}", str(value)]
+    cmd = job_command(job, str(corpus), threads, workers=0, device="cpu", extra=extra)
+    proc, wall = timed(subprocess.run, cmd, cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{model} training failed:\n{proc.stderr[-3000:]}")
+    last = parse_train_log(job.train_log).get("last", {})
+    metrics[f"train_epoch_s/{model}"] = last["train data_wait_s"] + last["train compute_s"]
+    metrics[f"train_process_s/{model}"] = wall
+
+
+def compare(metrics, baseline, tolerance: float):
+    """Print current vs baseline per metric; return the names that regressed."""
+    regressed = []
+    print(f"{'metric':<34} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"{name:<34} {'-':>10} {value:10.4f}")
+            continue
+        ratio = value / base
+        flag = ""
+        if ratio > 1 + tolerance:
+            regressed.append(name)
+            flag = "  SLOWER"
+        print(f"{name:<34} {base:10.4f} {value:10.4f} {ratio:7.2f}{flag}")
+    return regressed
+
+
+def main():
+    all_models = sorted(p.parent.parent.name for p in RECIPES_DIR.glob("*/hparams/train.yaml"))
+    parser = argparse.ArgumentParser(description="Offline CPU benchmarks on a synthetic corpus.")
+    parser.add_argument("--work_dir", default=None, help="Corpus, manifests and runs (default: a temp dir).")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS, choices=all_models)
+    parser.add_argument("--parkinson_speakers", type=int, default=28)
+    parser.add_argument("--young_speakers", type=int, default=15)
+    parser.add_argument("--elderly_speakers", type=int, default=22)
+    parser.add_argument("--files_per_speaker", type=int, default=4)
+    parser.add_argument("--min_duration", type=float, default=2.0)
+    parser.add_argument("--max_duration", type=float, default=8.0)
+    parser.add_argument("--workers", type=int, default=1, help="scan_dataset header-reading processes.")
+    parser.add_argument("--threads", type=int, default=4, help="torch threads for models and training.")
+    parser.add_argument("--pipeline_items", type=int, default=64, help="Items timed per audio pipeline.")
+    parser.add_argument("--runs", type=int, default=20, help="Timed forward passes per model.")
+    parser.add_argument("--skip_training", action="store_true")
+    parser.add_argument("--output", default=None, help="JSON file for this run.")
+    parser.add_argument("--baseline", default=None, help="Earlier --output to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix="pd_bench_"))
+    corpus, manifest_dir, run_root = work_dir / "corpus", work_dir / "manifests", work_dir / "runs"
+    corpus_config = {
+        "parkinson_speakers": args.parkinson_speakers,
+        "young_speakers": args.young_speakers,
+        "elderly_speakers": args.elderly_speakers,
+        "files_per_speaker": args.files_per_speaker,
+        "min_duration": args.min_duration,
+        "max_duration": args.max_duration,
+    }
+    n_files = make_corpus(corpus, **corpus_config)
+    print(f"Synthetic corpus: {n_files} wav files in {corpus}")
+
+    metrics = {}
+    bench_data_prep(corpus, manifest_dir, args.workers, metrics)
+    for model in args.models:
+        overrides = model_overrides(model, corpus, manifest_dir, run_root)
+        bench_model(model, overrides, args.pipeline_items, args.runs, metrics)
+        if not args.skip_training:
+            bench_training(model, overrides, corpus, run_root, args.threads, metrics)
+
+    result = {
+        "config": {
+            **corpus_config,
+            "models": args.models,
+            "threads": args.threads,
+            "workers": args.workers,
+            "overrides": {"common": COMMON_OVERRIDES, "tiny": TINY_OVERRIDES},
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "metrics": {name: round(value, 6) for name, value in metrics.items()},
+    }
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != result["config"]:
+            print("Warning: baseline was recorded with a different configuration")
+        regressed = compare(result["metrics"], baseline["metrics"], args.tolerance)
+        if regressed:
+            sys.exit(f"{len(regressed)} metric(s) slower than baseline by more than "
+                     f"{args.tolerance:.0%}: {', '.join(regressed)}")
+    else:
+        for name, value in result["metrics"].items():
+            print(f"{name:<34} {value:10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Train any Parkinson's recipe; the encoder family is chosen by the YAML.
+Usage:
+  python recipes/parkinsons_binary/train.py recipes/parkinsons_binary/xvector/hparams/train.yaml \
+      --data_folder data/raw/italian_parkinson
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "src"))
+
+from parkinsons_speech.recipe import run  # noqa: E402
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
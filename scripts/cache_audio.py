@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Write resampled, peak-normalised audio for existing manifests.
+Usage:
+  python scripts/cache_audio.py --data_root data/raw/italian_parkinson \
+      --manifest_dir data/manifests --out_dir data/audio_cache/8000 --sample_rate 8000
+Then train with `--manifest_dir data/audio_cache/8000` so recipes read the cache.
+With `--format packed`, each split is written to one contiguous `<split>.pack` file
+plus `<split>.index.json`; train with `--manifest_dir <out_dir> --packed_audio true`.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from parkinsons_speech import data_prep  # noqa: E402
+
+SPLITS = ("train", "valid", "test")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cache resampled audio for SpeechBrain manifests.")
+    parser.add_argument("--data_root", required=True, help="Root folder containing the wav files.")
+    parser.add_argument("--manifest_dir", default="data/manifests", help="Folder with train/valid/test json or jsonl.")
+    parser.add_argument("--out_dir", required=True, help="Where to write cached audio and manifests.")
+    parser.add_argument("--sample_rate", type=int, default=8000, help="Target sample rate of the recipes.")
+    parser.add_argument("--dtype", choices=["int16", "float32"], default="int16")
+    parser.add_argument(
+        "--format",
+        choices=["npy", "packed"],
+        default="npy",
+        help="One .npy file per utterance, or one memory-mappable pack per split.",
+    )
+    parser.add_argument("--overwrite", action="store_true", help="Rewrite files that already exist.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Imported after argument parsing: both pull in numpy, torch and torchaudio.
+    from parkinsons_speech import audio_cache, packed
+
+    data_root = Path(args.data_root).expanduser().resolve()
+    manifest_dir = Path(args.manifest_dir)
+    out_dir = Path(args.out_dir)
+
+    audio_cache.write_cache_info(out_dir, args.sample_rate, args.dtype, overwrite=args.overwrite)
+    for split in SPLITS:
+        manifest_path = data_prep.find_manifest(manifest_dir, split)
+        manifest = data_prep.load_manifest(manifest_path)
+        if args.format == "packed":
+            source_root = str(manifest_dir.resolve())
+            cached = {
+                utt_id: {**entry, "wav": entry["wav"].replace("{cache_root}", source_root)}
+                for utt_id, entry in manifest.items()
+            }
+            packed.pack_manifest(
+                cached,
+                out_dir / manifest_path.name,
+                data_root,
+                sample_rate=args.sample_rate,
+                dtype=args.dtype,
+            )
+        else:
+            cached = audio_cache.cache_manifest(
+                manifest,
+                data_root,
+                out_dir,
+                sample_rate=args.sample_rate,
+                dtype=args.dtype,
+                overwrite=args.overwrite,
+            )
+        data_prep.save_manifest(cached, out_dir / manifest_path.name)
+        print(f"{split}: cached {len(cached)} files")
+
+    print(f"Wrote cached audio and manifests to {out_dir.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Minimal client for scripts/serve.py.
+Usage:
+  python scripts/client.py path/to/a.wav path/to/b.wav --url http://127.0.0.1:8080
+"""
+import argparse
+import json
+import urllib.request
+from pathlib import Path
+
+
+def score(url: str, wav_path: Path, timeout: float = 60.0) -> dict:
+    """POST one wav file to ``<url>/predict`` and return the decoded JSON response."""
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/predict",
+        data=Path(wav_path).read_bytes(),
+        headers={"Content-Type": "audio/wav"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send wav files to a running inference server.")
+    parser.add_argument("wavs", nargs="+", help="Wav files to score.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    args = parser.parse_args()
+
+    for wav in args.wavs:
+        print(json.dumps({"wav": wav, **score(args.url, Path(wav))}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Speaker-grouped k-fold cross-validation over one shared audio cache.
+Usage:
+  python scripts/prepare_manifests.py --data_root data/raw/italian_parkinson \
+      --out_dir data/manifests/cv --folds 5
+  python scripts/cross_validate.py --data_root data/raw/italian_parkinson \
+      --folds_dir data/manifests/cv --models xvector ecapa_tdnn
+
+Every utterance is decoded and resampled once into --cache_dir; the folds
+are then trained concurrently (same scheduler as scripts/sweep.py) and test
+metrics are aggregated per model into <output_root>/cv_summary.json.
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from parkinsons_speech.cross_val import aggregate_folds, cache_folds, recipe_sample_rate  # noqa: E402
+from parkinsons_speech.data_prep import find_manifest  # noqa: E402
+from parkinsons_speech.sweep import make_jobs, run_sweep, write_summary  # noqa: E402
+from parkinsons_speech.utils import available_cpus, available_memory_gb  # noqa: E402
+
+RECIPES_DIR = ROOT / "recipes" / "parkinsons_binary"
+
+
+def main():
+    all_models = sorted(p.parent.parent.name for p in RECIPES_DIR.glob("*/hparams/train.yaml"))
+    parser = argparse.ArgumentParser(description="Cross-validate recipes on speaker-grouped folds.")
+    parser.add_argument("--data_root", required=True, help="Root of raw data referenced by the fold manifests.")
+    parser.add_argument("--folds_dir", default="data/manifests/cv", help="Output of prepare_manifests.py --folds.")
+    parser.add_argument(
+        "--cache_dir", default=None, help="Shared audio cache for all folds (default: data/audio_cache/cv_<rate>)."
+    )
+    parser.add_argument(
+        "--sample_rate", type=int, default=None, help="Cache rate; must match the recipes' sample_rate (the default)."
+    )
+    parser.add_argument("--dtype", choices=["int16", "float32"], default="int16")
+    parser.add_argument("--models", nargs="+", default=all_models, choices=all_models)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1986])
+    parser.add_argument("--output_root", default="results/cv", help="Runs go to <output_root>/fold_<k>/<model>/<seed>.")
+    parser.add_argument("--threads", type=int, default=available_cpus())
+    parser.add_argument("--threads_per_job", type=int, default=4)
+    parser.add_argument("--workers_per_job", type=int, default=1)
+    parser.add_argument("--memory_gb", type=float, default=round(0.9 * available_memory_gb(), 1))
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--force", action="store_true", help="Delete and re-train folds whose train log is complete.")
+    args, extra = parser.parse_known_args()
+
+    try:
+        sample_rate = recipe_sample_rate(RECIPES_DIR, args.models)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.sample_rate is not None and args.sample_rate != sample_rate:
+        parser.error(f"--sample_rate {args.sample_rate} does not match the recipes' sample_rate {sample_rate}")
+    cache_dir = Path(args.cache_dir or f"data/audio_cache/cv_{sample_rate}")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    fold_dirs = cache_folds(
+        Path(args.folds_dir),
+        Path(args.data_root).expanduser().resolve(),
+        cache_dir,
+        sample_rate=sample_rate,
+        dtype=args.dtype,
+    )
+    print(f"Cached audio for {len(fold_dirs)} folds in {cache_dir.resolve()}")
+
+    output_root = Path(args.output_root)
+    jobs = []
+    for fold_dir in fold_dirs:
+        manifest_format = find_manifest(fold_dir, "train").suffix.lstrip(".")
+        jobs.extend(
+            make_jobs(
+                RECIPES_DIR,
+                args.models,
+                args.seeds,
+                output_root / fold_dir.name,
+                job_memory_gb={},
+                label=fold_dir.name,
+                extra_args=["--manifest_dir", str(fold_dir.resolve()), "--manifest_format", manifest_format],
+            )
+        )
+
+    try:
+        run_sweep(
+            jobs,
+            data_folder=args.data_root,
+            log_dir=output_root / "sweep_logs",
+            total_threads=args.threads,
+            threads_per_job=args.threads_per_job,
+            memory_gb=args.memory_gb,
+            workers_per_job=args.workers_per_job,
+            device=args.device,
+            extra_args=extra,
+            force=args.force,
+        )
+    finally:
+        output_root.mkdir(parents=True, exist_ok=True)
+        write_summary(jobs, output_root / "sweep_summary.json")
+        summary = aggregate_folds(jobs)
+        with open(output_root / "cv_summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        for model, stats in summary.items():
+            error = stats.get("error_rate", {})
+            print(f"{model:<12} error_rate={error.get('mean', float('nan')):.4f} "
+                  f"± {error.get('std', float('nan')):.4f} over {error.get('n', 0)} runs")
+        print(f"Cross-validation summary written to {output_root / 'cv_summary.json'}")
+
+    if any(job.status == "failed" for job in jobs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Export a trained checkpoint as a dynamically INT8-quantized CPU artifact.
+Usage:
+  python scripts/export_quantized.py --hparams recipes/parkinsons_binary/xvector/hparams/train.yaml \
+      --checkpoint_dir results/xvector/1986/save --data_folder data/raw/italian_parkinson
+  python scripts/predict.py --artifact results/xvector/1986/save/model_int8.pt --data_folder ... --wav a.wav
+
+Reports serialized size, single-clip CPU latency and test.json accuracy of
+the float32 model and the INT8 artifact.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "scripts"))
+
+from predict import collect_inputs, predict_batches  # noqa: E402
+
+# torch and the model code are imported after argument parsing.
+
+
+def latency_ms(modules, hparams, runs: int) -> float:
+    """Median time to score one ``chunk_duration`` clip."""
+    import torch
+
+    from parkinsons_speech.inference import forward
+
+    wav = torch.randn(1, int(hparams["sample_rate"] * hparams["chunk_duration"])) * 0.1
+    times = []
+    with torch.inference_mode():
+        forward(modules, hparams, wav)
+        for _ in range(runs):
+            start = time.perf_counter()
+            forward(modules, hparams, wav)
+            times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def accuracy(modules, hparams, labels, manifest: Path, data_folder: Path, batch_size: int) -> float:
+    """Accuracy over a manifest with fixed crops, so two models see identical audio."""
+    import torch
+
+    from parkinsons_speech.data_prep import iter_manifest
+
+    truth = {utt_id: entry["label"] for utt_id, entry in iter_manifest(manifest)}
+    torch.manual_seed(0)
+    rows = predict_batches(modules, hparams, collect_inputs(str(manifest), data_folder), batch_size)
+    correct = sum(labels[int(torch.argmax(probs))] == truth[utt_id] for utt_id, _, probs in rows)
+    return correct / max(1, len(truth))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an INT8 dynamically quantized inference artifact.")
+    parser.add_argument("--hparams", required=True, help="Path to HyperPyYAML file used for training.")
+    parser.add_argument("--checkpoint_dir", required=True, help="Trained save_folder.")
+    parser.add_argument("--data_folder", required=True, help="Root of raw data (for manifest placeholders).")
+    parser.add_argument("--output", default=None, help="Artifact path (default: <checkpoint_dir>/model_int8.pt).")
+    parser.add_argument("--manifest", default=None, help="Manifest for the accuracy delta (default: test_annotation).")
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--runs", type=int, default=20, help="Timed forward passes for latency.")
+    parser.add_argument("--threads", type=int, default=None, help="torch threads while timing.")
+    parser.add_argument("--report", default=None, help="Optional JSON file for the report.")
+    parser.add_argument(
+        "--force", action="store_true", help="Export Conv1d-based families (xvector, ecapa_tdnn) anyway."
+    )
+    args = parser.parse_args()
+
+    import torch
+
+    from parkinsons_speech.export import (
+        linear_dominated,
+        load_artifact,
+        quantize_dynamic,
+        save_artifact,
+        serialized_mb,
+    )
+    from parkinsons_speech.inference import build_model, load_labels
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    checkpoint_dir = Path(args.checkpoint_dir)
+    data_folder = Path(args.data_folder)
+    hparams, modules = build_model(Path(args.hparams), checkpoint_dir, data_folder)
+    if not linear_dominated(hparams):
+        message = (
+            f"{hparams['encoder_family']} is mostly Conv1d, which dynamic quantization leaves in "
+            "float32; only its Linear layers would be INT8 and size/latency barely change"
+        )
+        if not args.force:
+            sys.exit(f"{message}. Pass --force to export it anyway.")
+        print(f"Warning: {message}.")
+    modules = {name: module.cpu() for name, module in modules.items()}
+    labels = load_labels(checkpoint_dir)
+
+    output = Path(args.output) if args.output else checkpoint_dir / "model_int8.pt"
+    save_artifact(output, hparams, quantize_dynamic(modules), labels, quantization="dynamic_int8_linear")
+    q_hparams, q_modules, _ = load_artifact(output)
+    print(f"Wrote {output}")
+
+    manifest = Path(args.manifest or hparams["test_annotation"])
+    report = {"artifact": str(output), "manifest": str(manifest)}
+    for name, (hp, mods) in {"fp32": (hparams, modules), "int8": (q_hparams, q_modules)}.items():
+        report[name] = {
+            "size_mb": round(serialized_mb(mods), 2),
+            "latency_ms": round(latency_ms(mods, hp, args.runs), 2),
+            "accuracy": round(accuracy(mods, hp, labels, manifest, data_folder, args.batch_size), 4),
+        }
+    report["artifact_mb"] = round(output.stat().st_size / 1024**2, 2)
+    report["accuracy_delta"] = round(report["int8"]["accuracy"] - report["fp32"]["accuracy"], 4)
+    report["speedup"] = round(report["fp32"]["latency_ms"] / report["int8"]["latency_ms"], 2)
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
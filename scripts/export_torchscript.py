@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Trace the full inference graph of a checkpoint into one TorchScript file.
+Usage:
+  python scripts/export_torchscript.py --hparams recipes/parkinsons_binary/xvector/hparams/train.yaml \
+      --checkpoint_dir results/xvector/1986/save --data_folder data/raw/italian_parkinson
+  python scripts/predict.py --scripted results/xvector/1986/save/model.ts --data_folder ... --wav a.wav
+
+The graph covers resampling, peak normalisation, features, encoder, pooling
+and the output probabilities. After saving, the scripted file is reloaded
+through the speechbrain-free runtime and compared on every utterance of
+the test manifest with the eager predictor (inference.preprocess +
+inference.forward, as predict.py runs it) on the same clip; the export
+fails above --atol.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "scripts"))
+
+from predict import collect_inputs  # noqa: E402
+
+# torch and the model code are imported after argument parsing.
+
+
+def verify(modules, hparams, scripted, items):
+    """Max absolute probability difference and argmax agreement with the eager predictor over ``items``."""
+    import torch
+
+    from parkinsons_speech.inference import forward, preprocess
+
+    max_diff = 0.0
+    agree = 0
+    with torch.inference_mode():
+        for _, path in items:
+            clip = scripted.crop(scripted.load(path))
+            wav = preprocess(clip, scripted.input_sample_rate, hparams).unsqueeze(0)
+            eager = forward(modules, hparams, wav)[0]
+            traced = scripted.module(clip.unsqueeze(0))[0]
+            max_diff = max(max_diff, float((eager - traced).abs().max()))
+            agree += int(torch.argmax(eager) == torch.argmax(traced))
+    return max_diff, agree / max(1, len(items))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a checkpoint as a TorchScript inference graph.")
+    parser.add_argument("--hparams", required=True, help="Path to HyperPyYAML file used for training.")
+    parser.add_argument("--checkpoint_dir", required=True, help="Trained save_folder.")
+    parser.add_argument("--data_folder", required=True, help="Root of raw data (for manifest placeholders).")
+    parser.add_argument("--output", default=None, help="Scripted file (default: <checkpoint_dir>/model.ts).")
+    parser.add_argument(
+        "--input_sample_rate",
+        type=int,
+        default=None,
+        help="Rate of the audio fed to the graph (default: the recipe's orig_sample_rate).",
+    )
+    parser.add_argument("--manifest", default=None, help="Manifest to verify on (default: test_annotation).")
+    parser.add_argument("--atol", type=float, default=1e-4, help="Largest allowed probability difference.")
+    args = parser.parse_args()
+
+    import torch
+
+    from parkinsons_speech.export import InferenceGraph, save_scripted, trace_graph
+    from parkinsons_speech.inference import build_model, load_labels, pad_crops
+    from parkinsons_speech.runtime import ScriptedModel
+
+    checkpoint_dir = Path(args.checkpoint_dir)
+    data_folder = Path(args.data_folder)
+    hparams, modules = build_model(Path(args.hparams), checkpoint_dir, data_folder)
+    modules = {name: module.cpu() for name, module in modules.items()}
+    labels = load_labels(checkpoint_dir)
+
+    input_sr = args.input_sample_rate or hparams["orig_sample_rate"]
+    num_samples = int(input_sr * hparams["chunk_duration"])
+    graph = InferenceGraph(modules, hparams, input_sr).eval()
+    output = Path(args.output) if args.output else checkpoint_dir / "model.ts"
+    meta = {
+        "labels": labels,
+        "encoder_family": hparams["encoder_family"],
+        "input_sample_rate": input_sr,
+        "sample_rate": hparams["sample_rate"],
+        "num_samples": num_samples,
+        "pad": pad_crops(hparams),
+    }
+    save_scripted(output, trace_graph(graph, num_samples), meta)
+
+    start = time.perf_counter()
+    scripted = ScriptedModel(output)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    manifest = Path(args.manifest or hparams["test_annotation"])
+    torch.manual_seed(0)
+    max_diff, agreement = verify(modules, hparams, scripted, collect_inputs(str(manifest), data_folder))
+    report = {
+        "scripted": str(output),
+        "size_mb": round(output.stat().st_size / 1024**2, 2),
+        "load_ms": round(load_ms, 1),
+        "manifest": str(manifest),
+        "max_abs_diff": max_diff,
+        "argmax_agreement": round(agreement, 4),
+    }
+    print(json.dumps(report, indent=2))
+    if max_diff > args.atol:
+        sys.exit(f"Scripted graph differs from the eager predictor by {max_diff:.2e} (> {args.atol:.0e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Measure throughput and latency of scripts/serve.py on one machine.
+Usage:
+  python scripts/load_test.py --url http://127.0.0.1:8080 --wavs "data/raw/**/*.wav" \
+      --requests 200 --concurrency 16
+"""
+import argparse
+import glob
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from client import score  # noqa: E402
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a running inference server.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--wavs", required=True, help="Glob of wav files to cycle through.")
+    parser.add_argument("--requests", type=int, default=100, help="Total number of requests.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once.")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the summary.")
+    args = parser.parse_args()
+
+    wavs = sorted(glob.glob(args.wavs, recursive=True))
+    if not wavs:
+        parser.error(f"No wav files match {args.wavs}")
+    jobs = [Path(wavs[i % len(wavs)]) for i in range(args.requests)]
+
+    def timed(wav_path):
+        start = time.perf_counter()
+        result = score(args.url, wav_path)
+        return (time.perf_counter() - start) * 1000, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(timed, jobs))
+    wall = time.perf_counter() - start
+
+    client_ms = [ms for ms, _ in results]
+    server_ms = [r["latency_ms"]["total"] for _, r in results]
+    batch_sizes = [r["batch_size"] for _, r in results]
+    summary = {
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(results) / wall, 3),
+        "client_ms": {
+            "mean": round(statistics.fmean(client_ms), 3),
+            "p50": round(percentile(client_ms, 50), 3),
+            "p95": round(percentile(client_ms, 95), 3),
+            "p99": round(percentile(client_ms, 99), 3),
+        },
+        "server_total_ms_mean": round(statistics.fmean(server_ms), 3),
+        "mean_batch_size": round(statistics.fmean(batch_sizes), 3),
+    }
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,97 +4,221 @@ Lightweight inference helper for trained checkpoints.
 Usage:
   python scripts/predict.py --hparams recipes/parkinsons_binary/xvector/hparams/train.yaml \
       --checkpoint_dir results/xvector/1986/save --data_folder data/raw/italian_parkinson --wav path/to/file.wav
+Batch mode scores a folder, a glob or a json/jsonl manifest with one model load:
+  python scripts/predict.py ... --input "recordings/2024-05-01/*.wav" --output scores.csv
+A quantized artifact from scripts/export_quantized.py replaces --hparams/--checkpoint_dir:
+  python scripts/predict.py --artifact results/xvector/1986/save/model_int8.pt --data_folder ... --wav a.wav
+and a TorchScript graph from scripts/export_torchscript.py runs without speechbrain:
+  python scripts/predict.py --scripted results/xvector/1986/save/model.ts --data_folder ... --wav a.wav
 """
 import argparse
+import csv
+import glob
+import json
 import sys
 from pathlib import Path
 
-import torch
-import torchaudio
-from hyperpyyaml import load_hyperpyyaml
-
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT / "src"))
 
-from parkinsons_speech.utils import random_crop  # noqa: E402
-
-
-DEFAULT_LABELS = ["not_parkinson", "parkinson"]
-
-
-def load_labels(save_folder: Path):
-    enc_path = save_folder / "label_encoder.txt"
-    if not enc_path.exists():
-        return DEFAULT_LABELS
-    labels = []
-    with open(enc_path) as f:
-        for line in f:
-            parts = line.strip().split()
-            if len(parts) >= 1:
-                labels.append(parts[0])
-    return labels or DEFAULT_LABELS
-
+# Model code is imported only once arguments are parsed: --help needs none of
+# it, and --scripted runs with torch and torchaudio alone (no speechbrain).
 
-def build_model(hparams_path: Path, checkpoint_dir: Path, data_folder: Path):
-    with open(hparams_path) as fin:
-        hparams = load_hyperpyyaml(fin)
 
-    hparams["data_folder"] = str(data_folder)
-    hparams["checkpointer"].checkpoints_dir = str(checkpoint_dir)
+def collect_inputs(spec: str, data_folder: Path):
+    """Resolve a wav folder, a glob pattern or a json/jsonl manifest into (id, path) pairs."""
+    from parkinsons_speech.data_prep import MANIFEST_SUFFIXES, iter_manifest
 
-    modules = hparams["modules"]
-    hparams["checkpointer"].recover_if_possible()
-    return hparams, modules
-
-
-def prepare_audio(path: Path, hparams):
-    sig, sr = torchaudio.load(path)
-    if sr != hparams["sample_rate"]:
-        sig = torchaudio.functional.resample(
-            sig, orig_freq=sr, new_freq=hparams["sample_rate"]
-        )
-    sig = random_crop(sig, hparams["sample_rate"], hparams["chunk_duration"])
-    sig = sig / torch.clamp(sig.abs().max(), min=1e-6)
-    return sig
-
-
-def forward(modules, hparams, wav: torch.Tensor):
-    lens = torch.tensor([1.0])
-    if "feature_extractor" in modules:
-        feats = modules["feature_extractor"](wav)
-        emb = modules["xvector"](feats, lens)
-        logits = modules["classifier"](emb)
+    path = Path(spec)
+    if path.suffix in MANIFEST_SUFFIXES:
+        replacements = {"data_root": str(data_folder), "cache_root": str(path.parent.resolve())}
+        return [
+            (utt_id, Path(entry["wav"].format_map(replacements)))
+            for utt_id, entry in iter_manifest(path)
+        ]
+    if path.is_dir():
+        paths = sorted(path.rglob("*.wav"))
     else:
-        outputs = modules["ssl_model"](wav, lens)
-        pooled = hparams["avg_pool"](outputs, lens)
-        logits = modules["output_mlp"](pooled.view(pooled.shape[0], -1))
-    probs = hparams["log_softmax"](logits).exp().squeeze(0)
-    return probs
+        paths = sorted(Path(p) for p in glob.glob(spec, recursive=True))
+    return [(p.stem, p) for p in paths]
+
+
+def predict_batches(modules, hparams, items, batch_size: int, hop_duration: float = None, failed=None):
+    """Yield ``(id, path, probs)`` for every input, scoring ``batch_size`` files at a time.
+
+    Inputs are prepared exactly like ``--wav`` (see ``inference.preprocess``).
+    Files that cannot be loaded are reported on stderr, appended to
+    ``failed`` as ``(id, path, error)`` and skipped.
+
+    With ``hop_duration`` each file is instead scored as one batch of
+    overlapping windows covering the whole recording.
+    """
+    import torch
+
+    from parkinsons_speech.inference import collate, forward, load_audio, prepare_audio, score_windowed
+
+    def load(utt_id, path, loader):
+        try:
+            return loader(path, hparams)
+        except Exception as exc:  # noqa: BLE001 - one unreadable file must not stop the batch
+            print(f"Skipping {path}: {exc}", file=sys.stderr)
+            if failed is not None:
+                failed.append((utt_id, path, str(exc)))
+            return None
+
+    with torch.inference_mode():
+        if hop_duration is not None:
+            for utt_id, path in items:
+                sig = load(utt_id, path, load_audio)
+                if sig is not None:
+                    yield utt_id, path, score_windowed(modules, hparams, sig, hop_duration)
+            return
+        for start in range(0, len(items), batch_size):
+            loaded = [
+                (utt_id, path, load(utt_id, path, prepare_audio))
+                for utt_id, path in items[start : start + batch_size]
+            ]
+            chunk = [(utt_id, path) for utt_id, path, sig in loaded if sig is not None]
+            if not chunk:
+                continue
+            sigs = [sig for _, _, sig in loaded if sig is not None]
+            wavs, lens = collate(sigs)
+            probs = forward(modules, hparams, wavs, lens)
+            for (utt_id, path), row in zip(chunk, probs):
+                yield utt_id, path, row
+
+
+def predict_scripted(model, items, failed=None):
+    """Yield ``(id, path, probs)`` for every input with a TorchScript graph, skipping unreadable files."""
+    for utt_id, path in items:
+        try:
+            sig = model.load(path)
+        except Exception as exc:  # noqa: BLE001 - one unreadable file must not stop the batch
+            print(f"Skipping {path}: {exc}", file=sys.stderr)
+            if failed is not None:
+                failed.append((utt_id, path, str(exc)))
+            continue
+        yield utt_id, path, model(sig)
+
+
+def write_predictions(rows, labels, output: Path) -> int:
+    """Write predictions as CSV, or JSONL when ``output`` ends with ``.jsonl``."""
+    import torch
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(output, "w", newline="") as f:
+        if output.suffix == ".jsonl":
+            writer = None
+        else:
+            writer = csv.writer(f)
+            writer.writerow(["id", "path", "prediction", *[f"p_{label}" for label in labels]])
+        for utt_id, path, probs in rows:
+            prediction = labels[int(torch.argmax(probs).item())]
+            scores = [round(float(p), 6) for p in probs]
+            if writer is None:
+                record = {"id": utt_id, "path": str(path), "prediction": prediction}
+                record.update({f"p_{label}": score for label, score in zip(labels, scores)})
+                f.write(json.dumps(record) + "\n")
+            else:
+                writer.writerow([utt_id, str(path), prediction, *scores])
+            count += 1
+    return count
+
+
+def print_prediction(probs, labels) -> None:
+    import torch
+
+    top_idx = int(torch.argmax(probs).item())
+    print("Prediction:", labels[top_idx])
+    for idx, label in enumerate(labels):
+        print(f"{label}: {probs[idx].item():.4f}")
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Run inference on a single wav file.")
-    parser.add_argument("--hparams", required=True, help="Path to HyperPyYAML file used for training.")
-    parser.add_argument("--checkpoint_dir", required=True, help="Folder containing saved checkpoints.")
+    parser = argparse.ArgumentParser(description="Run inference on one wav file or a batch of files.")
+    parser.add_argument("--hparams", help="Path to HyperPyYAML file used for training.")
+    parser.add_argument("--checkpoint_dir", help="Folder containing saved checkpoints.")
+    parser.add_argument("--artifact", help="Self-contained model from export_quantized.py (instead of the two above).")
+    parser.add_argument("--scripted", help="TorchScript graph from export_torchscript.py (instead of the above).")
     parser.add_argument("--data_folder", required=True, help="Root of raw data (for manifest placeholders).")
-    parser.add_argument("--wav", required=True, help="Path to wav file to classify.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--wav", help="Path to wav file to classify.")
+    source.add_argument("--input", help="Folder of wavs, glob pattern, or json/jsonl manifest to classify.")
+    parser.add_argument("--batch_size", type=int, default=8, help="Files scored per forward pass with --input.")
+    parser.add_argument("--output", default="predictions.csv", help="CSV or .jsonl output for --input.")
+    parser.add_argument(
+        "--windowed",
+        action="store_true",
+        help="Score the whole recording with overlapping chunk_duration windows instead of one random crop.",
+    )
+    parser.add_argument("--hop", type=float, default=None, help="Window hop in seconds (default: half a chunk).")
     args = parser.parse_args()
 
-    hparams_path = Path(args.hparams)
-    checkpoint_dir = Path(args.checkpoint_dir)
     data_folder = Path(args.data_folder)
-    wav_path = Path(args.wav)
-
-    hparams, modules = build_model(hparams_path, checkpoint_dir, data_folder)
-    labels = load_labels(checkpoint_dir)
-
-    wav = prepare_audio(wav_path, hparams).unsqueeze(0)
-    probs = forward(modules, hparams, wav)
-
-    top_idx = int(torch.argmax(probs).item())
-    print("Prediction:", labels[top_idx])
-    for idx, label in enumerate(labels):
-        print(f"{label}: {probs[idx].item():.4f}")
+    if args.scripted:
+        from parkinsons_speech.runtime import ScriptedModel
+
+        if args.windowed:
+            parser.error("--windowed is not supported with --scripted")
+        model = ScriptedModel(Path(args.scripted))
+        labels = model.labels
+        if args.input:
+            items = collect_inputs(args.input, data_folder)
+            if not items:
+                parser.error(f"No audio files found for --input {args.input}")
+            failed = []
+            count = write_predictions(predict_scripted(model, items, failed), labels, Path(args.output))
+            print(f"Wrote {count} predictions to {Path(args.output).resolve()}")
+            if failed:
+                print(f"Skipped {len(failed)} unreadable file(s); see the messages above")
+            return
+        print_prediction(model(model.load(Path(args.wav))), labels)
+        return
+
+    import torch
+
+    from parkinsons_speech.export import load_artifact
+    from parkinsons_speech.inference import (
+        build_model,
+        forward,
+        load_audio,
+        load_labels,
+        prepare_audio,
+        score_windowed,
+    )
+
+    if args.artifact:
+        hparams, modules, labels = load_artifact(Path(args.artifact))
+    elif args.hparams and args.checkpoint_dir:
+        checkpoint_dir = Path(args.checkpoint_dir)
+        hparams, modules = build_model(Path(args.hparams), checkpoint_dir, data_folder)
+        labels = load_labels(checkpoint_dir)
+    else:
+        parser.error("either --artifact or both --hparams and --checkpoint_dir are required")
+    hop = None
+    if args.windowed:
+        hop = args.hop if args.hop is not None else hparams["chunk_duration"] / 2
+
+    if args.input:
+        items = collect_inputs(args.input, data_folder)
+        if not items:
+            parser.error(f"No audio files found for --input {args.input}")
+        failed = []
+        rows = predict_batches(modules, hparams, items, args.batch_size, hop_duration=hop, failed=failed)
+        count = write_predictions(rows, labels, Path(args.output))
+        print(f"Wrote {count} predictions to {Path(args.output).resolve()}")
+        if failed:
+            print(f"Skipped {len(failed)} unreadable file(s); see the messages above")
+        return
+
+    with torch.inference_mode():
+        if hop is not None:
+            probs = score_windowed(modules, hparams, load_audio(Path(args.wav), hparams), hop)
+        else:
+            wav = prepare_audio(Path(args.wav), hparams).unsqueeze(0)
+            probs = forward(modules, hparams, wav)[0]
+    print_prediction(probs, labels)
 
 
 if __name__ == "__main__":
@@ -20,42 +20,95 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--test_ratio", type=float, default=0.2)
     parser.add_argument(
         "--split_by",
-        choices=["speaker", "file"],
+        choices=["speaker", "balanced", "file"],
         default="speaker",
-        help="Use speaker-level grouping or file-level stratification.",
+        help="Speaker-level grouping stratified by label, speaker-level grouping balancing "
+        "label and total duration per split, or file-level stratification.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to read wav headers while scanning.",
+    )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="JSON scan cache; only new or modified wav files are re-read.",
+    )
+    parser.add_argument(
+        "--folds",
+        type=int,
+        default=0,
+        help="Write K speaker-grouped folds to <out_dir>/fold_<k>/ instead of one split.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "jsonl"],
+        default="json",
+        help="Pretty-printed json manifests, or jsonl streamed one utterance per line "
+        "(train with --manifest_format jsonl).",
     )
     return parser.parse_args()
 
 
+def check_speaker_overlap(split) -> None:
+    for (a, b), shared in data_prep.speaker_overlap(split).items():
+        assert not shared, f"Speaker overlap between {a} and {b} ({shared} speakers)"
+
+
+def write_split(split, out_dir: Path, fmt: str = "json"):
+    ensure_dir(out_dir)
+    for name, table in split.items():
+        data_prep.write_manifest(table.rows(), out_dir / f"{name}.{fmt}")
+
+    summary = data_prep.summarize_split(split)
+    with open(out_dir / "split_summary.json", "w") as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
 def main():
     args = parse_args()
+    # Imported after argument parsing: pulls in numpy.
+    from parkinsons_speech.records import RecordTable
+
     set_seed(args.seed)
 
     out_dir = Path(args.out_dir)
     ensure_dir(out_dir)
 
-    records = data_prep.scan_dataset(Path(args.data_root))
+    records = RecordTable.from_records(
+        data_prep.scan_dataset(
+            Path(args.data_root),
+            workers=args.workers,
+            cache_path=Path(args.cache) if args.cache else None,
+        )
+    )
 
-    if args.split_by == "speaker":
-        split = data_prep.split_speaker_level(records, args.val_ratio, args.test_ratio, args.seed)
+    if args.folds:
+        if args.split_by != "speaker":
+            raise SystemExit("--folds requires --split_by speaker")
+        folds = data_prep.split_speaker_kfold(records, args.folds, args.val_ratio, args.seed)
+        summary = {}
+        for k, split in enumerate(folds):
+            check_speaker_overlap(split)
+            summary[f"fold_{k}"] = write_split(split, out_dir / f"fold_{k}", args.format)
+        with open(out_dir / "split_summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+    elif args.split_by in ("speaker", "balanced"):
+        splitter = (
+            data_prep.split_speaker_balanced
+            if args.split_by == "balanced"
+            else data_prep.split_speaker_level
+        )
+        split = splitter(records, args.val_ratio, args.test_ratio, args.seed)
         # Sanity check: no overlap in speakers
-        for a in ("train", "valid", "test"):
-            for b in ("train", "valid", "test"):
-                if a >= b:
-                    continue
-                assert set(r.speaker for r in split[a]).isdisjoint(
-                    set(r.speaker for r in split[b])
-                ), f"Speaker overlap between {a} and {b}"
+        check_speaker_overlap(split)
+        write_split(split, out_dir, args.format)
     else:
         split = data_prep.split_file_level(records, args.val_ratio, args.test_ratio, args.seed)
-
-    for name, subset in split.items():
-        manifest = data_prep.build_manifest(subset)
-        data_prep.save_manifest(manifest, out_dir / f"{name}.json")
-
-    summary = data_prep.summarize_split(split)
-    with open(out_dir / "split_summary.json", "w") as f:
-        json.dump(summary, f, indent=2)
+        write_split(split, out_dir, args.format)
 
     print(f"Wrote manifests to {out_dir.resolve()}")
 
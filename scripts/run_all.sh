@@ -8,13 +8,9 @@ export PYTHONPATH="src:${PYTHONPATH:-}"
 
 poetry run python scripts/prepare_manifests.py --data_root "${DATA_ROOT}" --out_dir "${MANIFEST_DIR}" --split_by speaker
 
-models=(xvector ecapa_tdnn wav2vec2 wavlm hubert)
+# Every recipe under recipes/parkinsons_binary/*/hparams/train.yaml, run concurrently
+# within the machine's thread and memory budget; see scripts/sweep.py for options.
+poetry run python scripts/sweep.py --data_root "${DATA_ROOT}" --device "${DEVICE:-cpu}" \
+  --seeds ${SEEDS:-1986} --threads_per_job "${THREADS_PER_JOB:-4}"
 
-for model in "${models[@]}"; do
-  hp="recipes/parkinsons_binary/${model}/hparams/train.yaml"
-  train_py="recipes/parkinsons_binary/${model}/train.py"
-  echo "=== Training ${model} ==="
-  poetry run python "${train_py}" "${hp}" --data_folder "${DATA_ROOT}" --device "${DEVICE:-cpu}"
-done
-
-echo "Runs finished. Update reports/results.md with metrics from logs in results/<model>/<seed>/train_log.txt."
+echo "Runs finished. Metrics per job are in results/sweep_summary.json; update reports/results.md from it."
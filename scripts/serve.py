@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Long-lived local inference server around a trained checkpoint.
+Usage:
+  python scripts/serve.py --hparams recipes/parkinsons_binary/xvector/hparams/train.yaml \
+      --checkpoint_dir results/xvector/1986/save --data_folder data/raw/italian_parkinson --port 8080
+  curl --data-binary @file.wav http://127.0.0.1:8080/predict
+
+The model is loaded once. Requests arriving within --batch_window_ms of each
+other are scored in one padded batch (up to --max_batch); every response
+reports its decode, queue, inference and total latency in milliseconds.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import queue
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+# torch, torchaudio and the model code are imported where they are used, so
+# --help and argument errors return without loading them.
+if TYPE_CHECKING:
+    import torch
+
+
+class _Request:
+    def __init__(self, sig: torch.Tensor):
+        self.sig = sig
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Collect concurrent requests for a short window and score them as one batch."""
+
+    def __init__(self, modules, hparams, labels, window_ms: float, max_batch: int):
+        self.modules = modules
+        self.hparams = hparams
+        self.labels = labels
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.queue: "queue.Queue[_Request]" = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, sig: torch.Tensor) -> _Request:
+        request = _Request(sig)
+        self.queue.put(request)
+        request.done.wait()
+        return request
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        import torch
+
+        from parkinsons_speech.inference import collate, forward
+
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            try:
+                wavs, lens = collate([r.sig for r in batch])
+                with torch.inference_mode():
+                    probs = forward(self.modules, self.hparams, wavs, lens)
+            except Exception as exc:  # noqa: BLE001 - reported back to every caller
+                for request in batch:
+                    request.error = str(exc)
+                    request.done.set()
+                continue
+            finished = time.perf_counter()
+            for request, row in zip(batch, probs):
+                request.result = {
+                    "prediction": self.labels[int(torch.argmax(row).item())],
+                    "probs": {label: round(float(p), 6) for label, p in zip(self.labels, row)},
+                    "batch_size": len(batch),
+                    "latency_ms": {
+                        "queue": round((started - request.enqueued) * 1000, 3),
+                        "inference": round((finished - started) * 1000, 3),
+                    },
+                }
+                request.done.set()
+
+
+def make_handler(batcher: MicroBatcher):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code: int, payload: dict):
+            body = json.dumps(payload).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "labels": batcher.labels})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"error": "not found"})
+                return
+            import torchaudio
+
+            from parkinsons_speech.inference import preprocess
+
+            received = time.perf_counter()
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                sig, sr = torchaudio.load(io.BytesIO(self.rfile.read(length)))
+                sig = preprocess(sig.mean(dim=0), sr, batcher.hparams)
+            except Exception as exc:  # noqa: BLE001 - malformed upload
+                self._send(400, {"error": f"could not decode audio: {exc}"})
+                return
+            decoded = time.perf_counter()
+            request = batcher.submit(sig)
+            if request.error is not None:
+                self._send(500, {"error": request.error})
+                return
+            result = request.result
+            result["latency_ms"]["decode"] = round((decoded - received) * 1000, 3)
+            result["latency_ms"]["total"] = round((time.perf_counter() - received) * 1000, 3)
+            self._send(200, result)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a trained checkpoint over local HTTP.")
+    parser.add_argument("--hparams", required=True, help="Path to HyperPyYAML file used for training.")
+    parser.add_argument("--checkpoint_dir", required=True, help="Folder containing saved checkpoints.")
+    parser.add_argument("--data_folder", required=True, help="Root of raw data (for manifest placeholders).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--batch_window_ms", type=float, default=10.0, help="How long to wait for more requests.")
+    parser.add_argument("--max_batch", type=int, default=16, help="Upper bound on requests per forward pass.")
+    args = parser.parse_args()
+
+    from parkinsons_speech.inference import build_model, load_labels
+
+    checkpoint_dir = Path(args.checkpoint_dir)
+    hparams, modules = build_model(Path(args.hparams), checkpoint_dir, Path(args.data_folder))
+    batcher = MicroBatcher(
+        modules, hparams, load_labels(checkpoint_dir), args.batch_window_ms, args.max_batch
+    )
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(batcher))
+    print(f"Serving on http://{args.host}:{args.port} (POST /predict, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
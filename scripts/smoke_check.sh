@@ -13,18 +13,27 @@ fi
 echo "Running smoke checks..."
 "${PYTHON_CMD[@]}" scripts/prepare_manifests.py --help >/dev/null
 "${PYTHON_CMD[@]}" scripts/predict.py --help >/dev/null
+"${PYTHON_CMD[@]}" scripts/export_quantized.py --help >/dev/null
+"${PYTHON_CMD[@]}" scripts/export_torchscript.py --help >/dev/null
+"${PYTHON_CMD[@]}" scripts/serve.py --help >/dev/null
+"${PYTHON_CMD[@]}" scripts/load_test.py --help >/dev/null
+"${PYTHON_CMD[@]}" scripts/stream_replay.py --help >/dev/null
+"${PYTHON_CMD[@]}" scripts/sweep.py --help >/dev/null
+"${PYTHON_CMD[@]}" scripts/cross_validate.py --help >/dev/null
+"${PYTHON_CMD[@]}" benchmarks/import_time.py --repeats 1 >/dev/null
 bash -n scripts/run_all.sh
 bash -n scripts/download_dataset.sh
-for recipe in recipes/parkinsons_binary/*/train.py; do
-  "${PYTHON_CMD[@]}" - <<PY >/dev/null
+"${PYTHON_CMD[@]}" - <<PY >/dev/null
 import importlib.util
 from pathlib import Path
 
-path = Path("${recipe}")
+path = Path("recipes/parkinsons_binary/train.py")
 spec = importlib.util.spec_from_file_location(path.stem, path)
 module = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(module)
 PY
+for hp in recipes/parkinsons_binary/*/hparams/train.yaml; do
+  grep -q '^encoder_family:' "${hp}"
 done
 
 echo "Smoke checks passed."
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Replay a wav file through the streaming scorer as if it arrived live.
+Usage:
+  python scripts/stream_replay.py --hparams recipes/parkinsons_binary/xvector/hparams/train.yaml \
+      --checkpoint_dir results/xvector/1986/save --data_folder data/raw/italian_parkinson --wav call.wav
+  python scripts/stream_replay.py ... --chunk_ms 20 --emit_ms 300 --realtime --output updates.jsonl
+
+The file is resampled to the model rate up front (a live source would
+deliver audio at that rate) and pushed in --chunk_ms chunks. Every update
+prints the stream time, the window scored, the class probabilities and the
+latency of the chunk that triggered it; the summary reports per-chunk
+latency percentiles, the real-time factor and, for reference, the offline
+score of the final window.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate live streaming inference from a wav file.")
+    parser.add_argument("--hparams", required=True, help="Path to HyperPyYAML file used for training.")
+    parser.add_argument("--checkpoint_dir", required=True, help="Folder containing saved checkpoints.")
+    parser.add_argument("--data_folder", required=True, help="Root of raw data (for manifest placeholders).")
+    parser.add_argument("--wav", required=True, help="Recording to replay.")
+    parser.add_argument("--chunk_ms", type=float, default=100.0, help="Audio per pushed chunk.")
+    parser.add_argument("--emit_ms", type=float, default=500.0, help="Audio between probability updates.")
+    parser.add_argument("--window", type=float, default=None, help="Seconds scored per update (default: chunk_duration).")
+    parser.add_argument("--realtime", action="store_true", help="Sleep so chunks arrive at the audio rate.")
+    parser.add_argument("--output", default=None, help="Optional JSONL file with one line per update.")
+    args = parser.parse_args()
+
+    import torch
+
+    from parkinsons_speech.audio_cache import load_source_audio
+    from parkinsons_speech.inference import build_model, forward, load_labels, resample
+    from parkinsons_speech.streaming import StreamingScorer
+
+    checkpoint_dir = Path(args.checkpoint_dir)
+    hparams, modules = build_model(Path(args.hparams), checkpoint_dir, Path(args.data_folder))
+    labels = load_labels(checkpoint_dir)
+    scorer = StreamingScorer(modules, hparams, emit_ms=args.emit_ms, window_s=args.window)
+
+    sig, sr = load_source_audio(Path(args.wav))
+    sig = resample(sig, sr, hparams)
+    step = max(1, int(args.chunk_ms * hparams["sample_rate"] / 1000))
+
+    updates, chunk_ms = [], []
+    start = time.perf_counter()
+    for offset in range(0, len(sig), step):
+        if args.realtime:
+            due = start + offset / hparams["sample_rate"]
+            time.sleep(max(0.0, due - time.perf_counter()))
+        pushed = time.perf_counter()
+        new = scorer.push(sig[offset : offset + step])
+        chunk_ms.append(1000 * (time.perf_counter() - pushed))
+        updates.extend(new)
+        for update in new:
+            probs = " ".join(f"{label}={p:.4f}" for label, p in zip(labels, update.probs.tolist()))
+            print(f"t={update.time_s:7.2f}s window={update.window_s:5.1f}s {probs} "
+                  f"latency={update.latency_ms:.1f}ms")
+    final = scorer.flush()
+    if final is not None:
+        updates.append(final)
+    audio_s = len(sig) / hparams["sample_rate"]
+
+    print(f"{len(chunk_ms)} chunks of {args.chunk_ms:g} ms, {len(updates)} updates over {audio_s:.1f} s")
+    print(f"chunk latency p50 {percentile(chunk_ms, 50):.2f} ms  p95 {percentile(chunk_ms, 95):.2f} ms  "
+          f"max {max(chunk_ms):.2f} ms  real-time factor {sum(chunk_ms) / 1000 / audio_s:.3f}")
+    if final is not None:
+        window = sig[-int(final.window_s * hparams["sample_rate"]) :]
+        with torch.inference_mode():
+            offline = forward(modules, hparams, (window / window.abs().max().clamp(min=1e-6)).unsqueeze(0))[0]
+        print("final   " + " ".join(f"{label}={p:.4f}" for label, p in zip(labels, final.probs.tolist())))
+        print("offline " + " ".join(f"{label}={p:.4f}" for label, p in zip(labels, offline.tolist())))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            for update in updates:
+                record = {"time_s": round(update.time_s, 3), "window_s": round(update.window_s, 3),
+                          "latency_ms": round(update.latency_ms, 3)}
+                record.update({f"p_{label}": round(p, 6) for label, p in zip(labels, update.probs.tolist())})
+                f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
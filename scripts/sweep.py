@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Train several recipes and seeds concurrently on one machine.
+Usage:
+  python scripts/sweep.py --data_root data/raw/italian_parkinson \
+      --models xvector ecapa_tdnn --seeds 1986 1987 --threads_per_job 4
+
+Jobs share the CPU in slices of --threads_per_job and start only while
+their estimated memory fits in --memory_gb. Re-running the same command
+skips finished runs and resumes interrupted ones from their checkpoints.
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from parkinsons_speech.sweep import make_jobs, run_sweep, write_summary  # noqa: E402
+from parkinsons_speech.utils import available_cpus, available_memory_gb  # noqa: E402
+
+RECIPES_DIR = ROOT / "recipes" / "parkinsons_binary"
+
+
+def parse_memory(values):
+    budgets = {}
+    for value in values:
+        name, sep, gb = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected NAME=GB, got {value!r}")
+        budgets[name] = float(gb)
+    return budgets
+
+
+def main():
+    all_models = sorted(p.parent.parent.name for p in RECIPES_DIR.glob("*/hparams/train.yaml"))
+    parser = argparse.ArgumentParser(description="Run recipes and seeds concurrently.")
+    parser.add_argument("--data_root", required=True, help="Root of raw data passed as --data_folder.")
+    parser.add_argument("--models", nargs="+", default=all_models, choices=all_models)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[1986])
+    parser.add_argument("--output_root", default="results", help="Runs go to <output_root>/<model>/<seed>.")
+    parser.add_argument("--threads", type=int, default=available_cpus(), help="Total CPU threads to use.")
+    parser.add_argument("--threads_per_job", type=int, default=4, help="torch.set_num_threads for each job.")
+    parser.add_argument("--workers_per_job", type=int, default=1, help="DataLoader workers for each job.")
+    parser.add_argument(
+        "--memory_gb",
+        type=float,
+        default=round(0.9 * available_memory_gb(), 1),
+        help="Memory budget shared by running jobs (default: 90%% of available memory).",
+    )
+    parser.add_argument(
+        "--job_memory",
+        nargs="*",
+        default=[],
+        metavar="NAME=GB",
+        help="Estimated memory per job by model or encoder family, e.g. ssl=10 xvector=1.5.",
+    )
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--force", action="store_true", help="Delete and re-train jobs whose train log is complete.")
+    parser.add_argument("--summary", default=None, help="Summary JSON (default: <output_root>/sweep_summary.json).")
+    args, extra = parser.parse_known_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    output_root = Path(args.output_root)
+    jobs = make_jobs(RECIPES_DIR, args.models, args.seeds, output_root, parse_memory(args.job_memory))
+    summary_path = Path(args.summary) if args.summary else output_root / "sweep_summary.json"
+
+    try:
+        run_sweep(
+            jobs,
+            data_folder=args.data_root,
+            log_dir=output_root / "sweep_logs",
+            total_threads=args.threads,
+            threads_per_job=args.threads_per_job,
+            memory_gb=args.memory_gb,
+            workers_per_job=args.workers_per_job,
+            device=args.device,
+            extra_args=extra,
+            force=args.force,
+        )
+    finally:
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        write_summary(jobs, summary_path)
+        for job in jobs:
+            test = job.metrics.get("test", {})
+            print(
+                f"{job.name:<20} {job.status:<12} wall_s={job.wall_s} "
+                f"test_error_rate={test.get('error_rate')} best_valid={job.metrics.get('best_valid_error_rate')}"
+            )
+        print(f"Summary written to {summary_path}")
+
+    if any(job.status == "failed" for job in jobs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
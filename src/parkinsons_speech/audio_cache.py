@@ -0,0 +1,131 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import torch
+import torchaudio
+
+logger = logging.getLogger(__name__)
+
+CACHE_INFO_FILE = "cache_info.json"
+CACHE_SUFFIX = ".npy"
+INT16_SCALE = 32767.0
+
+
+def preprocess_waveform(sig: torch.Tensor, orig_sr: int, sr: int) -> torch.Tensor:
+    """Resample a mono waveform and peak-normalise it to [-1, 1]."""
+    if orig_sr != sr:
+        sig = torchaudio.functional.resample(sig, orig_freq=orig_sr, new_freq=sr)
+    return sig / torch.clamp(sig.abs().max(), min=1e-6)
+
+
+def to_storage(sig: torch.Tensor, dtype: str) -> np.ndarray:
+    """Convert a peak-normalised waveform to the on-disk dtype."""
+    arr = sig.detach().cpu().numpy().astype(np.float32)
+    if dtype == "float32":
+        return arr
+    if dtype == "int16":
+        return np.round(np.clip(arr, -1.0, 1.0) * INT16_SCALE).astype(np.int16)
+    raise ValueError(f"Unsupported cache dtype: {dtype}")
+
+
+def from_storage(arr: np.ndarray) -> torch.Tensor:
+    """Inverse of :func:`to_storage`; always returns float32."""
+    if arr.dtype == np.int16:
+        return torch.from_numpy(arr.astype(np.float32) / INT16_SCALE)
+    return torch.from_numpy(np.asarray(arr, dtype=np.float32))
+
+
+def is_cached_audio(path: str) -> bool:
+    return str(path).endswith(CACHE_SUFFIX)
+
+
+def load_cached_audio(path: str) -> torch.Tensor:
+    """Load a cached waveform; no resampling or normalisation is needed."""
+    return from_storage(np.load(path))
+
+
+def read_cache_info(cache_dir: Path) -> Optional[Dict]:
+    info_path = Path(cache_dir) / CACHE_INFO_FILE
+    if not info_path.exists():
+        return None
+    with open(info_path) as f:
+        return json.load(f)
+
+
+def check_cache_info(cache_dir: Path, sample_rate: int) -> None:
+    """Fail early if a manifest folder holds audio cached at another rate."""
+    info = read_cache_info(cache_dir)
+    if info is not None and info["sample_rate"] != sample_rate:
+        raise ValueError(
+            f"Audio cache in {cache_dir} was written at {info['sample_rate']} Hz, "
+            f"but the recipe expects {sample_rate} Hz. Rebuild it with "
+            "scripts/cache_audio.py --sample_rate."
+        )
+
+
+def load_source_audio(path: Path) -> tuple[torch.Tensor, int]:
+    """Load a source wav as a mono float tensor."""
+    sig, sr = torchaudio.load(str(path))
+    return sig.mean(dim=0), sr
+
+
+def load_preprocessed(
+    wav: str, data_root: Path, cache_root: Path, sample_rate: int
+) -> torch.Tensor:
+    """Load a manifest ``wav`` entry (raw or cached) at ``sample_rate``."""
+    path = wav.format_map({"data_root": str(data_root), "cache_root": str(cache_root)})
+    if is_cached_audio(path):
+        return load_cached_audio(path)
+    sig, sr = load_source_audio(Path(path))
+    return preprocess_waveform(sig, sr, sample_rate)
+
+
+def cache_manifest(
+    manifest: Dict[str, Dict],
+    data_root: Path,
+    out_dir: Path,
+    sample_rate: int,
+    dtype: str = "int16",
+    overwrite: bool = False,
+) -> Dict[str, Dict]:
+    """
+    Write resampled, peak-normalised audio for every entry of a manifest.
+
+    Returns a manifest with the same keys whose ``wav`` fields point at
+    ``{cache_root}/audio/<utt_id>.npy``.
+    """
+    audio_dir = Path(out_dir) / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    cached = {}
+    for utt_id, entry in manifest.items():
+        target = audio_dir / f"{utt_id}{CACHE_SUFFIX}"
+        if overwrite or not target.exists():
+            sig = load_preprocessed(entry["wav"], data_root, out_dir, sample_rate)
+            np.save(target, to_storage(sig, dtype))
+        cached[utt_id] = {
+            **entry,
+            "wav": f"{{cache_root}}/audio/{utt_id}{CACHE_SUFFIX}",
+        }
+    return cached
+
+
+def write_cache_info(
+    out_dir: Path, sample_rate: int, dtype: str, overwrite: bool = False
+) -> None:
+    out_dir = Path(out_dir)
+    info = read_cache_info(out_dir)
+    if (
+        not overwrite
+        and info is not None
+        and (info["sample_rate"], info["dtype"]) != (sample_rate, dtype)
+    ):
+        raise ValueError(
+            f"{out_dir} already holds audio cached as {info}; use a new folder "
+            "or pass --overwrite."
+        )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / CACHE_INFO_FILE, "w") as f:
+        json.dump({"sample_rate": sample_rate, "dtype": dtype}, f, indent=2)
@@ -0,0 +1,84 @@
+from typing import Sequence, Tuple
+
+import torch
+import torchaudio
+
+
+def _valid_mask(lens: torch.Tensor, num_samples: int) -> torch.Tensor:
+    """``[batch, num_samples]`` mask of the unpadded samples for SpeechBrain relative ``lens``."""
+    valid = torch.round(lens * num_samples).long()
+    return torch.arange(num_samples, device=lens.device) < valid.unsqueeze(1)
+
+
+class BatchAugment(torch.nn.Module):
+    """
+    Speed perturbation, random gain and white noise on a padded training batch.
+
+    Every item draws its own speed, gain and SNR, but the work is done with
+    whole-batch tensor ops. The only per-group calls are one resampling per
+    distinct speed, so the cost per batch is fixed and does not grow with
+    per-item Python work in the DataLoader.
+
+    Speed ``s`` (in percent) plays the item ``s / 100`` times faster. Each
+    output keeps the input length: faster items are zero-padded and their
+    relative ``lens`` shrink; slower items are truncated. Noise is scaled
+    to the item's power over its valid samples and is added only there.
+    """
+
+    def __init__(
+        self,
+        speeds: Sequence[int] = (90, 100, 110),
+        snr_low: float = 10.0,
+        snr_high: float = 20.0,
+        gain_db: float = 6.0,
+        noise_prob: float = 1.0,
+    ):
+        super().__init__()
+        self.speeds = list(speeds)
+        self.snr_low = snr_low
+        self.snr_high = snr_high
+        self.gain_db = gain_db
+        self.noise_prob = noise_prob
+        # Resampling from ``speed`` to 100 "Hz" shortens the signal by speed/100;
+        # torchaudio reduces the ratio by its gcd, so the kernels stay small.
+        self.resamplers = torch.nn.ModuleList(
+            torch.nn.Identity() if speed == 100 else torchaudio.transforms.Resample(speed, 100)
+            for speed in self.speeds
+        )
+
+    def _speed(self, wavs: torch.Tensor, lens: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        batch, num_samples = wavs.shape
+        choice = torch.randint(len(self.speeds), (batch,), device=wavs.device)
+        out = wavs.clone()
+        new_lens = lens.clone()
+        for k, (speed, resampler) in enumerate(zip(self.speeds, self.resamplers)):
+            if speed == 100:
+                continue
+            idx = torch.nonzero(choice == k).squeeze(1)
+            if idx.numel() == 0:
+                continue
+            stretched = resampler(wavs[idx])
+            keep = min(num_samples, stretched.shape[1])
+            out[idx] = 0.0
+            out[idx, :keep] = stretched[:, :keep]
+            new_lens[idx] = torch.clamp(lens[idx] * 100 / speed, max=1.0)
+        return out, new_lens
+
+    def forward(self, wavs: torch.Tensor, lens: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        wavs = wavs.float()
+        batch, num_samples = wavs.shape
+        if any(speed != 100 for speed in self.speeds):
+            wavs, lens = self._speed(wavs, lens)
+
+        if self.gain_db:
+            gain_db = (torch.rand(batch, 1, device=wavs.device) * 2 - 1) * self.gain_db
+            wavs = wavs * torch.pow(10.0, gain_db / 20)
+
+        if self.noise_prob > 0:
+            mask = _valid_mask(lens, num_samples).to(wavs.dtype)
+            power = (wavs.square() * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            snr_db = self.snr_low + torch.rand(batch, device=wavs.device) * (self.snr_high - self.snr_low)
+            scale = torch.sqrt(power / torch.pow(10.0, snr_db / 10))
+            scale = scale * (torch.rand(batch, device=wavs.device) < self.noise_prob)
+            wavs = wavs + torch.randn_like(wavs) * scale.unsqueeze(1) * mask
+        return wavs, lens
@@ -0,0 +1,108 @@
+import time
+from copy import deepcopy
+from typing import Dict
+
+from speechbrain.dataio.sampler import DynamicBatchSampler
+
+from .utils import available_cpus, seed_worker
+
+_FIXED_BATCH_KEYS = ("batch_size", "shuffle", "drop_last", "sampler")
+_WORKER_ONLY_KEYS = ("persistent_workers", "prefetch_factor")
+# Valid/test passes are short and run once per epoch; "auto" gives them a few
+# workers that exit after each pass instead of a persistent set per core.
+EVAL_AUTO_WORKERS = 2
+
+
+def resolve_num_workers(value, train: bool = True) -> int:
+    """
+    ``"auto"`` (or a negative value) means one worker per available core but
+    one for the train loader, and at most ``EVAL_AUTO_WORKERS`` otherwise.
+    """
+    if value == "auto" or (isinstance(value, int) and value < 0):
+        workers = max(0, available_cpus() - 1)
+        return workers if train else min(workers, EVAL_AUTO_WORKERS)
+    return int(value)
+
+
+def worker_options(opts: Dict, train: bool = True) -> Dict:
+    """Resolve the worker count and drop options DataLoader rejects without workers."""
+    opts["num_workers"] = resolve_num_workers(opts.get("num_workers", 0), train)
+    if not train:
+        # Eval workers would otherwise sit idle through every training epoch.
+        opts.pop("persistent_workers", None)
+    if opts["num_workers"] == 0:
+        for key in _WORKER_ONLY_KEYS:
+            opts.pop(key, None)
+    else:
+        opts["worker_init_fn"] = seed_worker
+    return opts
+
+
+def dynamic_batch_sampler(dataset, hparams, shuffle: bool) -> DynamicBatchSampler:
+    """
+    Group utterances of similar duration into batches capped in total seconds.
+
+    Lengths come from the manifest ``length`` field, clipped at
+    ``chunk_duration`` because longer recordings are cropped to it.
+    """
+    max_len = float(hparams["chunk_duration"])
+    return DynamicBatchSampler(
+        dataset,
+        max_batch_length=hparams["max_batch_length"],
+        num_buckets=hparams["num_buckets"],
+        length_func=lambda x: min(float(x["length"]), max_len),
+        shuffle=shuffle,
+        batch_ordering="random" if shuffle else "ascending",
+        seed=hparams["seed"],
+    )
+
+
+def loader_options(hparams, dataset, train: bool = False) -> Dict:
+    """
+    DataLoader kwargs for one split.
+
+    With ``dynamic_batching`` the fixed ``batch_size``/``shuffle`` options
+    are replaced by a length-bucketed ``batch_sampler``; otherwise the
+    recipe's ``dataloader_options`` are used with shuffling off outside
+    training.
+    """
+    opts = worker_options(deepcopy(dict(hparams["dataloader_options"])), train)
+    if not hparams.get("dynamic_batching", False):
+        if not train:
+            opts["shuffle"] = False
+        return opts
+
+    shuffle = bool(opts.get("shuffle", False)) and train
+    for key in _FIXED_BATCH_KEYS:
+        opts.pop(key, None)
+    opts["batch_sampler"] = dynamic_batch_sampler(dataset, hparams, shuffle)
+    return opts
+
+
+class LoaderTimer:
+    """Split an epoch's wall time into waiting on the DataLoader and computing."""
+
+    def __init__(self):
+        self.data_s = 0.0
+        self.compute_s = 0.0
+        self.batches = 0
+        self._mark = time.perf_counter()
+
+    def batch_ready(self) -> None:
+        now = time.perf_counter()
+        self.data_s += now - self._mark
+        self._mark = now
+
+    def batch_done(self) -> None:
+        now = time.perf_counter()
+        self.compute_s += now - self._mark
+        self.batches += 1
+        self._mark = now
+
+    def summary(self) -> Dict[str, float]:
+        total = self.data_s + self.compute_s
+        return {
+            "data_wait_s": round(self.data_s, 2),
+            "compute_s": round(self.compute_s, 2),
+            "data_wait_frac": round(self.data_s / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,194 @@
+import contextlib
+import logging
+from functools import partial
+
+import speechbrain as sb
+import torch
+
+from .batching import LoaderTimer
+from .encoders import get_family
+from .precision import autocast, resolve_precision
+from .profiling import StageProfiler, TraceWindow, write_table
+from .utils import windowed_scores
+
+logger = logging.getLogger(__name__)
+
+
+class ParkinsonBrain(sb.Brain):
+    """
+    Training loop shared by every recipe.
+
+    Model-specific wiring (front-end, classifier, loss shapes, optimizers and
+    learning-rate schedule) is delegated to the encoder family named by the
+    ``encoder_family`` hparam; see :mod:`parkinsons_speech.encoders`.
+    The forward pass runs under autocast when ``precision`` is ``bf16``;
+    outputs are cast back to float32 so losses, metrics and the optimizer
+    step stay in full precision.
+
+    With ``profile: true`` every epoch appends a per-stage timing table
+    (data pipeline, features, classifier, objectives, backward/optimizer,
+    checkpointing) with audio throughput and peak RSS to the train log, and
+    ``profile_active > 0`` traces a window of the first training steps with
+    ``torch.profiler``; see :mod:`parkinsons_speech.profiling`.
+
+    With ``augment: true`` TRAIN batches of waveforms pass through
+    ``batch_augment`` (:class:`~parkinsons_speech.augment.BatchAugment`)
+    before the forward pass, outside autocast. Cached features or
+    embeddings have no waveforms left to augment.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.family = get_family(vars(self.hparams))
+        self.autocast_dtype = resolve_precision(
+            getattr(self.hparams, "precision", "fp32"), self.device
+        )
+        self.profiler = StageProfiler(self.device) if getattr(self.hparams, "profile", False) else None
+        self.trace = None
+        self.augment = None
+        if getattr(self.hparams, "augment", False):
+            if self.family.cache_enabled(vars(self.hparams)):
+                logger.warning("augment is ignored: training reads cached %s", self.family.cache_item)
+            else:
+                self.augment = self.hparams.batch_augment.to(self.device)
+
+    def _section(self, stage):
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.section(stage)
+
+    def compute_forward(self, batch, stage):
+        with self._section("to_device"):
+            batch = batch.to(self.device)
+        sig = None
+        if stage == sb.Stage.TRAIN and self.augment is not None:
+            with self._section("augment"):
+                sig = self.augment(*batch.sig)
+        with autocast(self.device, self.autocast_dtype):
+            outputs, lens = self._forward(batch, stage, sig)
+        return outputs.float(), lens
+
+    def _forward(self, batch, stage, sig=None):
+        hparams = vars(self.hparams)
+        if stage == sb.Stage.TEST and self.hparams.windowed_eval:
+            wavs, lens = batch.full_sig
+            outputs = windowed_scores(
+                partial(self.family.classify_waveforms, self.modules, hparams),
+                wavs,
+                lens,
+                self.hparams.sample_rate,
+                self.hparams.chunk_duration,
+                self.hparams.eval_hop_duration,
+                log_probs=self.family.log_probs,
+            )
+            return outputs, torch.ones_like(lens)
+        if self.family.cache_enabled(hparams):
+            feats, lens = getattr(batch, self.family.cache_item)
+        else:
+            wavs, lens = sig if sig is not None else batch.sig
+            with self._section("features"):
+                feats = self.family.features(self.modules, hparams, wavs, lens)
+        with self._section("classify"):
+            return self.family.classify(self.modules, hparams, feats, lens), lens
+
+    def compute_objectives(self, predictions, batch, stage):
+        preds, lens = predictions
+        labels, _ = batch.label_encoded
+
+        if stage == sb.Stage.TRAIN and hasattr(self.hparams.lr_annealing, "on_batch_end"):
+            self.hparams.lr_annealing.on_batch_end(self.optimizer)
+
+        with self._section("objectives"):
+            loss = self.family.compute_cost(vars(self.hparams), preds, labels, lens)
+
+        if stage != sb.Stage.TRAIN:
+            self.error_metrics.append(batch.id, *self.family.error_inputs(preds, labels, lens))
+        return loss
+
+    def fit_batch(self, batch):
+        self.loader_timer.batch_ready()
+        if self.profiler is None:
+            loss = super().fit_batch(batch)
+        else:
+            self.profiler.add_pipeline(getattr(batch, "pipeline_timing", None))
+            self.profiler.add_batch(self._audio_seconds(batch))
+            # Whatever fit_batch spends outside the nested sections is the
+            # backward pass and the optimizer step.
+            with self.profiler.remainder("backward_step"):
+                loss = super().fit_batch(batch)
+            if self.trace is not None:
+                self.trace.step()
+        self.loader_timer.batch_done()
+        return loss
+
+    def _audio_seconds(self, batch) -> float:
+        """Seconds of audio in a batch (crop length for cached inputs)."""
+        if hasattr(batch, "sig"):
+            wavs, lens = batch.sig
+            return float((lens * wavs.shape[1]).sum()) / self.hparams.sample_rate
+        return len(batch.id) * self.hparams.chunk_duration
+
+    def on_stage_start(self, stage, epoch=None):
+        self.loss_metric = sb.utils.metric_stats.MetricStats(
+            metric=sb.nnet.losses.nll_loss
+        )
+        if stage == sb.Stage.TRAIN:
+            self.loader_timer = LoaderTimer()
+            if self.hparams.train_sampler is not None:
+                self.hparams.train_sampler.set_epoch(epoch)
+            if self.profiler is not None:
+                self.profiler.reset()
+                if self.hparams.profile_active > 0 and self.trace is None:
+                    self.trace = TraceWindow(
+                        self.hparams.profile_folder,
+                        wait=self.hparams.profile_wait,
+                        active=self.hparams.profile_active,
+                    )
+        elif self.profiler is not None:
+            self.profiler.phase = stage.name.lower()
+        if stage != sb.Stage.TRAIN:
+            self.error_metrics = self.hparams.error_stats()
+
+    def on_stage_end(self, stage, stage_loss, epoch=None):
+        if stage == sb.Stage.TRAIN:
+            self.train_loss = stage_loss
+            self.train_timing = self.loader_timer.summary()
+            if self.profiler is not None:
+                self.train_timing.update(self.profiler.summary())
+            if self.trace is not None:
+                # The trace window never spans more than the first epoch.
+                self.trace.stop()
+            return
+
+        error = self.error_metrics.summarize("average")
+        stats = {"loss": stage_loss, "error_rate": error, "accuracy": 1 - error}
+
+        if stage == sb.Stage.VALID:
+            lr_stats = self.family.anneal(self, epoch, stats)
+            self.hparams.train_logger.log_stats(
+                {"Epoch": epoch, **lr_stats},
+                train_stats={"loss": self.train_loss, **self.train_timing},
+                valid_stats=stats,
+            )
+            if self.profiler is not None:
+                self.profiler.phase = "epoch"
+            with self._section("checkpoint"):
+                self.checkpointer.save_and_keep_only(
+                    meta=stats, min_keys=["error_rate"]
+                )
+            if self.profiler is not None and sb.utils.distributed.if_main_process():
+                write_table(
+                    self.hparams.train_logger.save_file,
+                    self.profiler.table(f"epoch {epoch} (train + valid)"),
+                )
+        elif stage == sb.Stage.TEST:
+            self.hparams.train_logger.log_stats(
+                {"Epoch loaded": self.hparams.epoch_counter.current},
+                test_stats=stats,
+            )
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def init_optimizers(self):
+        if not self.family.init_optimizers(self):
+            super().init_optimizers()
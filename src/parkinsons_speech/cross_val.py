@@ -0,0 +1,111 @@
+import re
+import statistics
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .data_prep import find_manifest, load_manifest, save_manifest
+
+SPLITS = ("train", "valid", "test")
+FOLD_PREFIX = "fold_"
+TEST_METRICS = ("error_rate", "accuracy", "loss")
+
+_SAMPLE_RATE_RE = re.compile(r"^sample_rate:\s*(\d+)", re.MULTILINE)
+
+
+def recipe_sample_rate(recipes_dir: Path, models: List[str]) -> int:
+    """
+    The ``sample_rate`` shared by the recipes of ``models``, read from their YAML text.
+
+    All folds share one audio cache at a single rate, so recipes that
+    disagree (or a recipe without a literal ``sample_rate``) raise
+    ``ValueError``.
+    """
+    rates = {}
+    for model in models:
+        match = _SAMPLE_RATE_RE.search((Path(recipes_dir) / model / "hparams" / "train.yaml").read_text())
+        if match is None:
+            raise ValueError(f"No sample_rate in the {model} recipe")
+        rates[model] = int(match.group(1))
+    if len(set(rates.values())) > 1:
+        raise ValueError(f"Recipes need different sample rates for one shared cache: {rates}")
+    return next(iter(rates.values()))
+
+
+def fold_dirs(folds_dir: Path) -> List[Path]:
+    """Fold folders written by ``prepare_manifests.py --folds``, in fold order."""
+    dirs = [p for p in Path(folds_dir).glob(f"{FOLD_PREFIX}*") if p.is_dir()]
+    return sorted(dirs, key=lambda p: int(p.name[len(FOLD_PREFIX):]))
+
+
+def _load_fold(fold_dir: Path) -> Dict[str, Tuple[Path, Dict[str, Dict]]]:
+    paths = {split: find_manifest(fold_dir, split) for split in SPLITS}
+    return {split: (path, load_manifest(path)) for split, path in paths.items()}
+
+
+def cache_folds(
+    folds_dir: Path,
+    data_root: Path,
+    out_dir: Path,
+    sample_rate: int,
+    dtype: str = "int16",
+) -> List[Path]:
+    """
+    Decode and resample every utterance once and point all folds at that cache.
+
+    Audio goes to ``<out_dir>/audio`` exactly as ``scripts/cache_audio.py``
+    writes it; each fold's manifests are rewritten to
+    ``<out_dir>/fold_<k>/`` with ``{cache_root}/../audio`` paths, so all
+    folds share one copy. Utterances already cached are not re-read.
+    Returns the cached fold folders.
+    """
+    from . import audio_cache
+
+    out_dir = Path(out_dir)
+    folds = {fold_dir.name: _load_fold(fold_dir) for fold_dir in fold_dirs(folds_dir)}
+    if not folds:
+        raise FileNotFoundError(f"No {FOLD_PREFIX}<k> folders in {folds_dir}")
+
+    everything = {}
+    for manifests in folds.values():
+        for _, manifest in manifests.values():
+            everything.update(manifest)
+    audio_cache.write_cache_info(out_dir, sample_rate, dtype)
+    cached = audio_cache.cache_manifest(everything, data_root, out_dir, sample_rate, dtype)
+
+    cached_dirs = []
+    for name, manifests in folds.items():
+        fold_out = out_dir / name
+        audio_cache.write_cache_info(fold_out, sample_rate, dtype)
+        for path, manifest in manifests.values():
+            fold_manifest = {
+                utt_id: {
+                    **cached[utt_id],
+                    "wav": cached[utt_id]["wav"].replace("{cache_root}", "{cache_root}/.."),
+                }
+                for utt_id in manifest
+            }
+            save_manifest(fold_manifest, fold_out / path.name)
+        cached_dirs.append(fold_out)
+    return cached_dirs
+
+
+def aggregate_folds(jobs) -> Dict[str, Dict]:
+    """Mean and standard deviation of each model's test metrics across folds and seeds."""
+    per_model: Dict[str, List[Dict]] = {}
+    for job in jobs:
+        test = job.metrics.get("test")
+        if test:
+            per_model.setdefault(job.model, []).append({"fold": job.label, "seed": job.seed, **test})
+
+    summary = {}
+    for model, runs in per_model.items():
+        summary[model] = {"runs": runs}
+        for metric in TEST_METRICS:
+            values = [r[metric] for r in runs if isinstance(r.get(metric), float)]
+            if values:
+                summary[model][metric] = {
+                    "mean": statistics.fmean(values),
+                    "std": statistics.stdev(values) if len(values) > 1 else 0.0,
+                    "n": len(values),
+                }
+    return summary
@@ -1,14 +1,23 @@
 import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import torchaudio
-from sklearn.model_selection import train_test_split
+# numpy, torchaudio and scikit-learn are imported where they are used so that
+# importing this module (e.g. for ``prepare_manifests.py --help``) stays cheap.
+if TYPE_CHECKING:
+    from .records import RecordTable
 
 logger = logging.getLogger(__name__)
 
+# ``.json`` manifests are one pretty-printed object, as SpeechBrain's
+# ``from_json`` expects; ``.jsonl`` manifests hold one ``{"id": ..., ...}``
+# object per line and are written and read as a stream.
+MANIFEST_SUFFIXES = (".json", ".jsonl")
+
 
 PARKINSON_FOLDERS = {
     "28 people with parkinson's disease",
@@ -24,7 +33,7 @@ def _normalize_part(part: str) -> str:
     return part.lower().replace("’", "'")
 
 
-@dataclass
+@dataclass(slots=True)
 class Record:
     """Container for a single audio example."""
 
@@ -53,6 +62,8 @@ def infer_speaker_id(path: Path) -> str:
 
 def compute_duration(path: Path) -> float:
     """Compute duration in seconds using torchaudio.info."""
+    import torchaudio
+
     try:
         info = torchaudio.info(str(path))
         if info.sample_rate == 0:
@@ -72,17 +83,20 @@ def compute_duration(path: Path) -> float:
             return len(f) / f.samplerate
 
 
-def build_manifest(records: Iterable[Record]) -> Dict[str, Dict]:
-    """Convert Record objects into the SpeechBrain JSON manifest structure."""
-    manifest = {}
+def manifest_rows(records: Iterable[Record]) -> Iterator[Tuple[str, Dict]]:
+    """Yield ``(utt_id, entry)`` manifest rows for Record objects."""
     for rec in records:
-        manifest[rec.utt_id] = {
+        yield rec.utt_id, {
             "wav": rec.wav,
             "length": rec.duration,
             "label": rec.label,
             "speaker": rec.speaker,
         }
-    return manifest
+
+
+def build_manifest(records: Iterable[Record]) -> Dict[str, Dict]:
+    """Convert Record objects into the SpeechBrain JSON manifest structure."""
+    return dict(manifest_rows(records))
 
 
 def _make_id(wav_path: Path, root: Path) -> str:
@@ -90,122 +104,366 @@ def _make_id(wav_path: Path, root: Path) -> str:
     return rel.with_suffix("").as_posix().replace("/", "_").replace(" ", "_")
 
 
-def scan_dataset(root: Path, placeholder: str = "{data_root}") -> List[Record]:
+def _load_scan_cache(path: Path) -> Dict[str, Dict]:
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable scan cache %s: %s", path, exc)
+        return {}
+
+
+def _save_scan_cache(cache: Dict[str, Dict], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def _compute_durations(paths: List[Path], workers: int) -> List[float]:
+    if workers <= 1 or len(paths) <= 1:
+        return [compute_duration(p) for p in paths]
+    chunksize = max(1, len(paths) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(compute_duration, paths, chunksize=chunksize))
+
+
+def scan_dataset(
+    root: Path,
+    placeholder: str = "{data_root}",
+    workers: int = 1,
+    cache_path: Optional[Path] = None,
+) -> Iterator[Record]:
     """
     Walk a dataset folder and collect metadata for all wav files.
 
+    Durations are read (or taken from the cache) up front; the Records are
+    then yielded one at a time so callers can stream them into a manifest or
+    a :class:`~parkinsons_speech.records.RecordTable` without a list of
+    objects in between.
+
     Args:
         root: Root folder containing the audio data.
         placeholder: Replacement token stored in manifests for portability.
+        workers: Number of processes used to read wav headers.
+        cache_path: Optional JSON file with durations keyed by relative path,
+            size and mtime. Only new or modified files are re-read.
     """
     root = Path(root).expanduser().resolve()
     if not root.exists():
         raise FileNotFoundError(f"Data root does not exist: {root}")
 
     wav_paths = sorted(root.rglob("*.wav"))
-    records: List[Record] = []
+    cache = _load_scan_cache(Path(cache_path)) if cache_path else {}
+
+    keys = []
+    durations: Dict[str, float] = {}
+    stale: List[Path] = []
     for wav_path in wav_paths:
-        duration = compute_duration(wav_path)
-        label = infer_label(wav_path)
-        speaker = infer_speaker_id(wav_path)
-        utt_id = _make_id(wav_path, root)
-        portable_path = f"{placeholder}/{wav_path.relative_to(root).as_posix()}"
-        records.append(
-            Record(
-                utt_id=utt_id,
-                wav=portable_path,
-                speaker=speaker,
-                label=label,
-                duration=duration,
-            )
+        stat = wav_path.stat()
+        key = wav_path.relative_to(root).as_posix()
+        keys.append((key, stat.st_size, stat.st_mtime_ns))
+        entry = cache.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            durations[key] = entry["duration"]
+        else:
+            stale.append(wav_path)
+
+    if stale:
+        logger.info("Reading headers for %d/%d wav files", len(stale), len(wav_paths))
+    for wav_path, duration in zip(stale, _compute_durations(stale, workers)):
+        durations[wav_path.relative_to(root).as_posix()] = duration
+
+    if cache_path:
+        new_cache = {
+            key: {"size": size, "mtime_ns": mtime_ns, "duration": durations[key]}
+            for key, size, mtime_ns in keys
+        }
+        if new_cache != cache:
+            _save_scan_cache(new_cache, Path(cache_path))
+
+    return _iter_records(wav_paths, root, placeholder, durations)
+
+
+def _iter_records(
+    wav_paths: List[Path], root: Path, placeholder: str, durations: Dict[str, float]
+) -> Iterator[Record]:
+    for wav_path in wav_paths:
+        rel_path = wav_path.relative_to(root).as_posix()
+        yield Record(
+            utt_id=_make_id(wav_path, root),
+            wav=f"{placeholder}/{rel_path}",
+            speaker=infer_speaker_id(wav_path),
+            label=infer_label(wav_path),
+            duration=durations[rel_path],
         )
-    return records
 
 
-def _group_by_speaker(records: List[Record]) -> Dict[str, List[Record]]:
-    grouped: Dict[str, List[Record]] = {}
-    for rec in records:
-        grouped.setdefault(rec.speaker, []).append(rec)
-    return grouped
+def _label_counts(table: "RecordTable"):
+    """``[n_speakers, n_labels]`` recording counts from one ``bincount`` over code pairs."""
+    import numpy as np
+
+    n_labels = len(table.labels)
+    pairs = table.speaker_codes.astype(np.int64) * n_labels + table.label_codes
+    counts = np.bincount(pairs, minlength=len(table.speakers) * n_labels)
+    return counts.reshape(len(table.speakers), n_labels)
 
 
-def _speaker_label(speaker_records: List[Record]) -> str:
-    labels = {r.label for r in speaker_records}
-    if len(labels) != 1:
-        raise ValueError(f"Mixed labels for speaker: {labels}")
-    return labels.pop()
+def _speaker_labels(table: "RecordTable"):
+    """
+    Speaker codes present in ``table`` and the label code of each.
+
+    Raises if a speaker has recordings with different labels.
+    """
+    import numpy as np
+
+    counts = _label_counts(table)
+    labels_per_speaker = np.count_nonzero(counts, axis=1)
+    mixed = np.flatnonzero(labels_per_speaker > 1)
+    if len(mixed):
+        speaker = mixed[0]
+        raise ValueError(
+            f"Mixed labels for speaker {table.speakers[speaker]}: "
+            f"{set(table.labels[np.flatnonzero(counts[speaker])])}"
+        )
+    speakers = np.flatnonzero(labels_per_speaker)
+    return speakers, counts[speakers].argmax(axis=1)
+
+
+def _take_speakers(table: "RecordTable", splits) -> Dict[str, "RecordTable"]:
+    """Split rows by speaker code with one lookup per row instead of a set per split."""
+    import numpy as np
+
+    assignment = np.full(len(table.speakers), -1, dtype=np.int8)
+    for k, spk in enumerate(splits.values()):
+        assignment[spk] = k
+    row_split = assignment[table.speaker_codes]
+    return {name: table.take(np.flatnonzero(row_split == k)) for k, name in enumerate(splits)}
 
 
 def split_speaker_level(
-    records: List[Record], val_ratio: float, test_ratio: float, seed: int
-) -> Dict[str, List[Record]]:
-    grouped = _group_by_speaker(records)
-    speakers = sorted(grouped.keys())
-    speaker_labels = [_speaker_label(grouped[s]) for s in speakers]
+    table: "RecordTable", val_ratio: float, test_ratio: float, seed: int
+) -> Dict[str, "RecordTable"]:
+    from sklearn.model_selection import train_test_split
 
-    train_spk, test_spk = train_test_split(
+    speakers, speaker_labels = _speaker_labels(table)
+    train_spk, test_spk, train_labels, _ = train_test_split(
         speakers,
+        speaker_labels,
         test_size=test_ratio,
         stratify=speaker_labels,
         random_state=seed,
     )
-    train_labels = [_speaker_label(grouped[s]) for s in train_spk]
     train_spk, val_spk = train_test_split(
         train_spk,
         test_size=val_ratio / (1 - test_ratio),
         stratify=train_labels,
         random_state=seed,
     )
-
     splits = {"train": train_spk, "valid": val_spk, "test": test_spk}
-    out: Dict[str, List[Record]] = {k: [] for k in splits}
-    for split_name, spk_list in splits.items():
-        for spk in spk_list:
-            out[split_name].extend(grouped[spk])
-    return out
+    return _take_speakers(table, splits)
+
+
+def split_speaker_balanced(
+    table: "RecordTable", val_ratio: float, test_ratio: float, seed: int
+) -> Dict[str, "RecordTable"]:
+    """
+    Speaker-level split that balances total seconds as well as labels.
+
+    Every split with a non-zero ratio is first seeded with one speaker of
+    each label (train its longest, valid and test its shortest), so all of
+    them see every label; a label with too few speakers raises
+    ``ValueError``. The remaining speakers are visited from the longest to
+    the shortest total duration. Each goes to the split furthest below its
+    share of that label's seconds: ``1 - val_ratio - test_ratio`` for
+    train, ``val_ratio`` for valid and ``test_ratio`` for test. Speakers
+    with equal duration are taken in a ``seed``-shuffled order. The
+    heuristic is largest-first greedy filling: one sort plus one pass per
+    label. Each split ends within about one speaker's duration of its
+    target.
+    """
+    import numpy as np
+
+    speakers, speaker_labels = _speaker_labels(table)
+    seconds = np.bincount(
+        table.speaker_codes, weights=table.duration, minlength=len(table.speakers)
+    )[speakers]
+    ratios = np.array([1 - val_ratio - test_ratio, val_ratio, test_ratio])
+    rng = np.random.default_rng(seed)
+
+    assigned: List[List[int]] = [[] for _ in ratios]
+    for label in np.unique(speaker_labels):
+        members = rng.permutation(np.flatnonzero(speaker_labels == label))
+        members = members[np.argsort(-seconds[members], kind="stable")]
+        deficit = ratios * seconds[members].sum()
+        seeded = [k for k in (1, 2) if ratios[k] > 0]
+        if len(members) < len(seeded) + 1:
+            raise ValueError(
+                f"Label {label} has {len(members)} speaker(s); one per train/valid/test split is needed"
+            )
+        first = {0: members[0], **{k: members[-1 - j] for j, k in enumerate(seeded)}}
+        for k, i in first.items():
+            assigned[k].append(speakers[i])
+            deficit[k] -= seconds[i]
+        for i in members[1 : len(members) - len(seeded)]:
+            k = int(np.argmax(deficit))
+            assigned[k].append(speakers[i])
+            deficit[k] -= seconds[i]
+
+    names = ("train", "valid", "test")
+    return _take_speakers(
+        table, {name: np.asarray(spk, dtype=np.int64) for name, spk in zip(names, assigned)}
+    )
+
+
+def split_speaker_kfold(
+    table: "RecordTable", n_folds: int, val_ratio: float, seed: int
+) -> List[Dict[str, "RecordTable"]]:
+    """
+    Speaker-grouped, label-stratified k-fold splits.
+
+    Every speaker is in the test split of exactly one fold. The other
+    speakers of a fold are divided into train and valid so that valid holds
+    about ``val_ratio`` of all speakers, as in :func:`split_speaker_level`.
+    """
+    from sklearn.model_selection import StratifiedKFold, train_test_split
+
+    speakers, speaker_labels = _speaker_labels(table)
+
+    folds = []
+    kfold = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    for rest_idx, test_idx in kfold.split(speakers, speaker_labels):
+        train_spk, val_spk = train_test_split(
+            speakers[rest_idx],
+            test_size=val_ratio / (1 - 1 / n_folds),
+            stratify=speaker_labels[rest_idx],
+            random_state=seed,
+        )
+        splits = {"train": train_spk, "valid": val_spk, "test": speakers[test_idx]}
+        folds.append(_take_speakers(table, splits))
+    return folds
 
 
 def split_file_level(
-    records: List[Record], val_ratio: float, test_ratio: float, seed: int
-) -> Dict[str, List[Record]]:
-    ids = list(range(len(records)))
-    labels = [r.label for r in records]
+    table: "RecordTable", val_ratio: float, test_ratio: float, seed: int
+) -> Dict[str, "RecordTable"]:
+    import numpy as np
+    from sklearn.model_selection import train_test_split
 
     train_ids, test_ids = train_test_split(
-        ids, test_size=test_ratio, stratify=labels, random_state=seed
+        np.arange(len(table)), test_size=test_ratio, stratify=table.label_codes, random_state=seed
     )
-    train_labels = [labels[i] for i in train_ids]
     train_ids, val_ids = train_test_split(
         train_ids,
         test_size=val_ratio / (1 - test_ratio),
-        stratify=train_labels,
+        stratify=table.label_codes[train_ids],
         random_state=seed,
     )
-
     split_ids = {"train": train_ids, "valid": val_ids, "test": test_ids}
-    out: Dict[str, List[Record]] = {k: [] for k in split_ids}
-    for split_name, idxs in split_ids.items():
-        out[split_name] = [records[i] for i in idxs]
-    return out
-
-
-def summarize_split(records: Dict[str, List[Record]]) -> Dict[str, Dict[str, int]]:
-    summary: Dict[str, Dict[str, int]] = {}
-    for split, recs in records.items():
-        labels = {}
-        speakers = set()
-        for r in recs:
-            labels[r.label] = labels.get(r.label, 0) + 1
-            speakers.add(r.speaker)
-        summary[split] = {
-            "examples": len(recs),
-            "speakers": len(speakers),
-            **{f"label_{k}": v for k, v in labels.items()},
+    return {name: table.take(np.sort(idxs)) for name, idxs in split_ids.items()}
+
+
+def summarize_split(split: Dict[str, "RecordTable"]) -> Dict[str, Dict]:
+    import numpy as np
+
+    summary: Dict[str, Dict] = {}
+    for name, table in split.items():
+        counts = np.bincount(table.label_codes, minlength=len(table.labels))
+        summary[name] = {
+            "examples": len(table),
+            "speakers": int(np.count_nonzero(speaker_presence(table))),
+            "hours": round(float(table.duration.sum(dtype=np.float64)) / 3600, 3),
+            **{f"label_{k}": int(v) for k, v in zip(table.labels, counts) if v},
         }
     return summary
 
 
-def save_manifest(manifest: Dict[str, Dict], path: Path) -> None:
+def speaker_presence(table: "RecordTable"):
+    """Boolean mask over ``table.speakers`` of the speakers with at least one row."""
+    import numpy as np
+
+    return np.bincount(table.speaker_codes, minlength=len(table.speakers)) > 0
+
+
+def speaker_overlap(split: Dict[str, "RecordTable"]) -> Dict[Tuple[str, str], int]:
+    """
+    Number of shared speakers for every pair of splits.
+
+    The splits must come from one table (see ``RecordTable.take``) so that
+    their speaker codes agree; each pair is then one AND of presence masks.
+    """
+    import numpy as np
+
+    names = list(split)
+    tables = list(split.values())
+    if any(t.speakers is not tables[0].speakers for t in tables[1:]):
+        raise ValueError("Splits do not share speaker categories; take them from one RecordTable")
+    presence = np.stack([speaker_presence(t) for t in tables])
+    shared = presence.astype(np.int64) @ presence.T.astype(np.int64)
+    return {
+        (names[i], names[j]): int(shared[i, j])
+        for i in range(len(names))
+        for j in range(i + 1, len(names))
+    }
+
+
+def find_manifest(folder: Path, split: str) -> Path:
+    """``<folder>/<split>.json`` or ``.jsonl``, whichever exists."""
+    for suffix in MANIFEST_SUFFIXES:
+        path = Path(folder) / f"{split}{suffix}"
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"No {split} manifest ({'/'.join(MANIFEST_SUFFIXES)}) in {folder}")
+
+
+def iter_manifest(path: Path) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield ``(utt_id, entry)`` pairs of a manifest.
+
+    ``.jsonl`` manifests are parsed one line at a time; ``.json`` manifests
+    are loaded whole.
+    """
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix != ".jsonl":
+            yield from json.load(f).items()
+            return
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield entry.pop("id"), entry
+
+
+def load_manifest(path: Path) -> Dict[str, Dict]:
+    return dict(iter_manifest(path))
+
+
+def write_manifest(rows: Iterable[Tuple[str, Dict]], path: Path) -> int:
+    """
+    Write ``(utt_id, entry)`` rows to a ``.json`` or ``.jsonl`` manifest.
+
+    ``.jsonl`` rows are written as they are produced, so a manifest never
+    has to exist as one dict in memory. Returns the number of rows.
+    """
+    path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix not in MANIFEST_SUFFIXES:
+        raise ValueError(f"Unsupported manifest suffix {path.suffix!r}; use {MANIFEST_SUFFIXES}")
+    count = 0
     with open(path, "w") as f:
-        json.dump(manifest, f, indent=2)
+        if path.suffix == ".json":
+            manifest = dict(rows)
+            json.dump(manifest, f, indent=2)
+            return len(manifest)
+        for utt_id, entry in rows:
+            f.write(json.dumps({"id": utt_id, **entry}))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def save_manifest(manifest: Dict[str, Dict], path: Path) -> None:
+    write_manifest(manifest.items(), path)
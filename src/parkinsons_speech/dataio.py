@@ -0,0 +1,277 @@
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict
+
+import speechbrain as sb
+import torch
+import torchaudio
+
+from . import embedding_cache, feature_cache
+from .audio_cache import check_cache_info, is_cached_audio, load_cached_audio
+from .data_prep import iter_manifest
+from .packed import PackedWaveforms
+from .utils import crop_read_window, num_classes, prepare_label_encoder, random_crop
+
+SPLITS = ("train", "valid", "test")
+
+logger = logging.getLogger(__name__)
+
+
+def annotations(hparams) -> Dict[str, str]:
+    """Manifest path of every split."""
+    return {name: hparams[f"{name}_annotation"] for name in SPLITS}
+
+
+def load_dataset(path, replacements, dynamic_items, output_keys):
+    """
+    ``DynamicItemDataset`` over a ``.json`` or ``.jsonl`` manifest.
+
+    ``.json`` goes through SpeechBrain's ``from_json``. ``.jsonl`` manifests
+    are read line by line, applying the same ``{placeholder}`` replacements
+    to every string field, so the pretty-printed text is never parsed whole.
+    """
+    if Path(path).suffix != ".jsonl":
+        return sb.dataio.dataset.DynamicItemDataset.from_json(
+            json_path=path,
+            replacements=replacements,
+            dynamic_items=dynamic_items,
+            output_keys=output_keys,
+        )
+    data = {
+        utt_id: {
+            key: value.format_map(replacements) if isinstance(value, str) else value
+            for key, value in entry.items()
+        }
+        for utt_id, entry in iter_manifest(path)
+    }
+    return sb.dataio.dataset.DynamicItemDataset(data, dynamic_items, output_keys)
+
+
+def dataio_prep(hparams):
+    """
+    Build the train/valid/test ``DynamicItemDataset`` objects shared by every recipe.
+
+    Each dataset provides a randomly cropped ``sig``, the uncropped
+    ``full_sig`` (used by windowed evaluation and the feature caches) and
+    ``label_encoded``. Audio comes from the raw wavs, the ``.npy`` cache or
+    a packed store depending on the manifests and ``packed_audio``.
+
+    With ``seek_crop: true`` the crop window is drawn from the frame count
+    in the wav header before reading, and only that frame range (plus a
+    resampling margin) is decoded and resampled; the crop matches the
+    read-everything path up to float rounding. The header, not the manifest
+    ``length``, is used because one frame of error in the count changes
+    the crop a seed picks. Cached and packed audio and
+    recordings no longer than ``chunk_duration`` are still read whole.
+
+    With ``profile: true`` each item also carries ``pipeline_timing``: the
+    seconds its worker spent reading, resampling and cropping it.
+    """
+    label_encoder = sb.dataio.encoder.CategoricalEncoder()
+
+    @sb.utils.data_pipeline.takes("label")
+    @sb.utils.data_pipeline.provides("label", "label_encoded")
+    def label_pipeline(label):
+        yield label
+        yield label_encoder.encode_label_torch(label)
+
+    def normalize(sig):
+        return sig / torch.clamp(sig.abs().max(), min=1e-6)
+
+    def resample(sig):
+        return torchaudio.functional.resample(
+            sig,
+            orig_freq=hparams["orig_sample_rate"],
+            new_freq=hparams["sample_rate"],
+        )
+
+    def read_full(wav):
+        start = time.perf_counter()
+        if is_cached_audio(wav):
+            return load_cached_audio(wav), {"read_audio": time.perf_counter() - start}
+        sig = sb.dataio.dataio.read_audio(wav)
+        read = time.perf_counter()
+        sig = resample(sig)
+        return sig, {"read_audio": read - start, "resample": time.perf_counter() - read}
+
+    def crop(sig):
+        start = time.perf_counter()
+        sig = random_crop(
+            sig,
+            hparams["sample_rate"],
+            hparams["chunk_duration"],
+            pad=not hparams["dynamic_batching"],
+        )
+        sig = normalize(sig)
+        return sig, {"random_crop": time.perf_counter() - start}
+
+    @sb.utils.data_pipeline.takes("wav")
+    @sb.utils.data_pipeline.provides("raw_sig", "load_timing")
+    def load_pipeline(wav):
+        sig, timing = read_full(wav)
+        yield sig
+        yield timing
+
+    def packed_load_pipeline(store):
+        @sb.utils.data_pipeline.takes("id")
+        @sb.utils.data_pipeline.provides("raw_sig", "load_timing")
+        def pipeline(utt_id):
+            start = time.perf_counter()
+            sig = store[utt_id]
+            read = time.perf_counter() - start
+            yield sig
+            yield {"read_audio": read}
+
+        return pipeline
+
+    @sb.utils.data_pipeline.takes("raw_sig")
+    @sb.utils.data_pipeline.provides("sig", "crop_timing")
+    def audio_pipeline(sig):
+        sig, timing = crop(sig)
+        yield sig
+        yield timing
+
+    @sb.utils.data_pipeline.takes("load_timing", "crop_timing")
+    @sb.utils.data_pipeline.provides("pipeline_timing")
+    def timing_pipeline(load_timing, crop_timing):
+        return {**load_timing, **crop_timing}
+
+    orig_sr, sr = hparams["orig_sample_rate"], hparams["sample_rate"]
+    max_len = int(sr * hparams["chunk_duration"])
+
+    @sb.utils.data_pipeline.takes("wav")
+    @sb.utils.data_pipeline.provides("sig", "crop_timing")
+    def seek_audio_pipeline(wav):
+        window = None
+        start = time.perf_counter()
+        if not is_cached_audio(wav):
+            num_frames = torchaudio.info(wav).num_frames
+            window = crop_read_window(num_frames, orig_sr, sr, hparams["chunk_duration"])
+        if window is not None:
+            stop = window.frame_offset + window.num_frames
+            sig = sb.dataio.dataio.read_audio({"file": wav, "start": window.frame_offset, "stop": stop})
+            read = time.perf_counter()
+            sig = resample(sig)[window.skip : window.skip + max_len]
+            done = time.perf_counter()
+            if sig.shape[-1] == max_len:
+                sig = normalize(sig)
+                yield sig
+                yield {
+                    "read_audio": read - start,
+                    "resample": done - read,
+                    "random_crop": time.perf_counter() - done,
+                }
+                return
+            logger.warning(
+                "%s: header reports %d frames but the crop window is short; reading the whole file",
+                wav, num_frames,
+            )
+        sig, load_timing = read_full(wav)
+        if window is None:
+            sig, crop_timing = crop(sig)
+        else:
+            # Re-crop at the window already drawn: a second randint would put
+            # this and every later crop in the worker out of step with full reads.
+            start = time.perf_counter()
+            sig = sig[..., window.start : window.start + max_len]
+            if not hparams["dynamic_batching"]:
+                sig = torch.nn.functional.pad(sig, (0, max_len - sig.shape[-1]))
+            sig = normalize(sig)
+            crop_timing = {"random_crop": time.perf_counter() - start}
+        yield sig
+        yield {**load_timing, **crop_timing}
+
+    @sb.utils.data_pipeline.takes("crop_timing")
+    @sb.utils.data_pipeline.provides("pipeline_timing")
+    def seek_timing_pipeline(crop_timing):
+        return crop_timing
+
+    @sb.utils.data_pipeline.takes("raw_sig")
+    @sb.utils.data_pipeline.provides("full_sig")
+    def full_audio_pipeline(sig):
+        return normalize(sig)
+
+    output_keys = ["id", "sig", "label_encoded"]
+    if hparams.get("profile", False):
+        output_keys.append("pipeline_timing")
+    datasets = {}
+    for name, path in annotations(hparams).items():
+        cache_root = os.path.dirname(os.path.abspath(path))
+        check_cache_info(cache_root, hparams["sample_rate"])
+        if hparams.get("packed_audio", False):
+            sig_items = [packed_load_pipeline(PackedWaveforms(path)), audio_pipeline, timing_pipeline]
+        elif hparams.get("seek_crop", False):
+            sig_items = [load_pipeline, seek_audio_pipeline, seek_timing_pipeline]
+        else:
+            sig_items = [load_pipeline, audio_pipeline, timing_pipeline]
+        datasets[name] = load_dataset(
+            path,
+            replacements={"data_root": hparams["data_folder"], "cache_root": cache_root},
+            dynamic_items=[*sig_items, full_audio_pipeline, label_pipeline],
+            output_keys=output_keys,
+        )
+
+    label_encoder = prepare_label_encoder(
+        datasets, hparams["save_folder"], output_key="label", expected_len=num_classes(hparams)
+    )
+    return datasets
+
+
+def prepare_feature_caches(hparams, datasets, fbank):
+    """Compute Fbank features once per split and crop them in the feature domain."""
+    data_json = annotations(hparams)
+    chunk_samples = int(hparams["sample_rate"] * hparams["chunk_duration"])
+    for name, dataset in datasets.items():
+        cache_path = Path(hparams["feature_cache_folder"]) / name
+        key = feature_cache.cache_key(fbank, hparams, data_json[name])
+        if not feature_cache.is_fresh(cache_path, key):
+            sb.utils.distributed.run_on_main(
+                feature_cache.build_feature_cache,
+                kwargs={
+                    "dataset": dataset,
+                    "fbank": fbank,
+                    "cache_path": cache_path,
+                    "key": key,
+                    "chunk_samples": chunk_samples,
+                },
+            )
+        feature_cache.attach_feature_store(
+            dataset,
+            cache_path,
+            output_keys=["id", "feats", "label_encoded"],
+            pad=not hparams["dynamic_batching"],
+        )
+
+
+def prepare_embedding_caches(hparams, datasets, device):
+    """Encode every split once with the frozen SSL model and read the cache instead."""
+    ssl_model = hparams["ssl_model"].eval()
+
+    def encode(wavs, lens):
+        outputs = ssl_model(wavs, lens)
+        outputs = hparams["avg_pool"](outputs, lens)
+        return outputs.view(outputs.shape[0], -1)
+
+    data_json = annotations(hparams)
+    for name, dataset in datasets.items():
+        crops = hparams["ssl_cache_crops"] if name == "train" else 1
+        cache_path = Path(hparams["ssl_cache_folder"]) / name
+        key = embedding_cache.cache_key(hparams, data_json[name], crops)
+        if not embedding_cache.is_fresh(cache_path, key):
+            sb.utils.distributed.run_on_main(
+                embedding_cache.build_embedding_cache,
+                kwargs={
+                    "dataset": dataset,
+                    "encode": encode,
+                    "cache_path": cache_path,
+                    "key": key,
+                    "crops": crops,
+                    "batch_size": hparams["batch_size"],
+                    "device": device,
+                },
+            )
+        embedding_cache.attach_embedding_cache(
+            dataset, cache_path, output_keys=["id", "ssl_emb", "label_encoded"]
+        )
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import random
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import speechbrain as sb
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(hparams, manifest_path: os.PathLike, crops: int) -> Dict:
+    """Everything that changes the cached embeddings of a frozen SSL model."""
+    manifest_path = Path(manifest_path).resolve()
+    return {
+        "source": hparams["sslmodel_hub"],
+        "sample_rate": hparams["sample_rate"],
+        "chunk_duration": hparams["chunk_duration"],
+        "crops": crops,
+        "manifest": str(manifest_path),
+        "manifest_mtime_ns": manifest_path.stat().st_mtime_ns,
+    }
+
+
+def _cache_paths(cache_path: Path):
+    cache_path = Path(cache_path)
+    return cache_path.with_suffix(".npy"), cache_path.with_suffix(".json")
+
+
+def is_fresh(cache_path: Path, key: Dict) -> bool:
+    data_path, meta_path = _cache_paths(cache_path)
+    if not (data_path.exists() and meta_path.exists()):
+        return False
+    with open(meta_path) as f:
+        return json.load(f)["key"] == key
+
+
+@torch.no_grad()
+def build_embedding_cache(
+    dataset,
+    encode: Callable[[torch.Tensor, torch.Tensor], torch.Tensor],
+    cache_path: Path,
+    key: Dict,
+    crops: int = 1,
+    batch_size: int = 16,
+    device: str = "cpu",
+) -> None:
+    """
+    Run a frozen encoder over ``dataset`` and store pooled embeddings.
+
+    ``encode`` maps padded ``(wavs, lens)`` to ``[batch, dim]`` embeddings.
+    The dataset is traversed ``crops`` times, so with a random-crop audio
+    pipeline each utterance keeps several crops to sample from in training.
+    """
+    data_path, meta_path = _cache_paths(cache_path)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+
+    ids = list(dataset.data_ids)
+    rows = {utt_id: i for i, utt_id in enumerate(ids)}
+    table = None
+    with dataset.output_keys_as(["id", "sig"]):
+        loader = sb.dataio.dataloader.make_dataloader(dataset, batch_size=batch_size, shuffle=False)
+        for crop in range(crops):
+            for batch in loader:
+                wavs, lens = batch.sig
+                emb = encode(wavs.to(device), lens.to(device)).float().cpu().numpy()
+                if table is None:
+                    table = np.zeros((len(ids), crops, emb.shape[-1]), dtype=np.float32)
+                for utt_id, vec in zip(batch.id, emb):
+                    table[rows[utt_id], crop] = vec
+            logger.info("Cached SSL embeddings for crop %d/%d of %s", crop + 1, crops, cache_path)
+
+    np.save(data_path, table)
+    with open(meta_path, "w") as f:
+        json.dump({"key": key, "ids": ids}, f)
+
+
+class EmbeddingCache:
+    """Lookup of cached embeddings by utterance id; one random crop per call."""
+
+    def __init__(self, cache_path: Path):
+        data_path, meta_path = _cache_paths(cache_path)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        self.rows = {utt_id: i for i, utt_id in enumerate(meta["ids"])}
+        self.table = np.load(data_path, mmap_mode="r")
+
+    def __getitem__(self, utt_id: str) -> torch.Tensor:
+        crops = self.table[self.rows[utt_id]]
+        return torch.from_numpy(np.array(crops[random.randrange(crops.shape[0])]))
+
+
+def attach_embedding_cache(dataset, cache_path: Path, output_keys) -> None:
+    """Expose cached embeddings as the ``ssl_emb`` item of ``dataset``."""
+    cache = EmbeddingCache(cache_path)
+
+    @sb.utils.data_pipeline.takes("id")
+    @sb.utils.data_pipeline.provides("ssl_emb")
+    def embedding_pipeline(utt_id):
+        return cache[utt_id]
+
+    dataset.add_dynamic_item(embedding_pipeline)
+    dataset.set_output_keys(output_keys)
@@ -0,0 +1,156 @@
+"""
+Encoder families plugged into the shared ``ParkinsonBrain``.
+
+A recipe selects its family with the ``encoder_family`` hparam. Every
+method takes the ``modules`` and ``hparams`` mappings explicitly so the same
+code serves training (``brain.modules``/``vars(brain.hparams)``) and the
+inference helpers (the dicts loaded from HyperPyYAML).
+"""
+from typing import Dict, Type
+
+import speechbrain as sb
+import torch
+
+
+class EncoderFamily:
+    """Fbank front-end followed by an embedding model and a log-softmax classifier."""
+
+    feature_module = "feature_extractor"
+    embedding_module = "xvector"
+    # Dataset item holding precomputed inputs when the family cache is enabled.
+    cache_item = "feats"
+    cache_flag = "cache_features"
+    # Whether outputs are log-probabilities (affects window aggregation).
+    log_probs = True
+
+    def cache_enabled(self, hparams) -> bool:
+        return bool(hparams.get(self.cache_flag, False))
+
+    def setup(self, hparams, run_opts) -> None:
+        """Prepare pretrained parts before the Brain is built."""
+
+    def prepare_caches(self, hparams, datasets, run_opts) -> None:
+        from .dataio import prepare_feature_caches
+
+        prepare_feature_caches(hparams, datasets, hparams[self.feature_module])
+
+    def features(self, modules, hparams, wavs, lens):
+        return modules[self.feature_module](wavs)
+
+    def classify(self, modules, hparams, feats, lens):
+        embeddings = modules[self.embedding_module](feats, lens)
+        return hparams["log_softmax"](modules["classifier"](embeddings))
+
+    def classify_waveforms(self, modules, hparams, wavs, lens):
+        return self.classify(modules, hparams, self.features(modules, hparams, wavs, lens), lens)
+
+    def probabilities(self, hparams, outputs):
+        """Map classifier outputs to class probabilities for inference."""
+        return outputs.exp()
+
+    def compute_cost(self, hparams, preds, labels, lens):
+        return hparams["compute_cost"](preds, labels, lens)
+
+    def error_inputs(self, preds, labels, lens):
+        return preds, labels, lens
+
+    def init_optimizers(self, brain) -> bool:
+        """Create family-specific optimizers; return False to use the Brain default."""
+        return False
+
+    def anneal(self, brain, epoch, stats) -> Dict[str, float]:
+        """Step the learning-rate schedule after validation and return the values to log."""
+        old_lr, new_lr = brain.hparams.lr_annealing(epoch)
+        sb.nnet.schedulers.update_learning_rate(brain.optimizer, new_lr)
+        return {"lr": old_lr}
+
+
+class XvectorFamily(EncoderFamily):
+    pass
+
+
+class EcapaFamily(EncoderFamily):
+    """ECAPA-TDNN: sentence mean normalisation and a cosine (AAM) classifier."""
+
+    feature_module = "compute_features"
+    embedding_module = "embedding_model"
+    # Classifier outputs are cosine scores, so windows are averaged without
+    # renormalising them as log-probabilities.
+    log_probs = False
+
+    def classify(self, modules, hparams, feats, lens):
+        feats = modules["mean_var_norm"](feats, lens)
+        embeddings = modules[self.embedding_module](feats, lens)
+        return modules["classifier"](embeddings)
+
+    def probabilities(self, hparams, outputs):
+        return torch.softmax(hparams["score_scale"] * outputs, dim=-1)
+
+
+class SSLFamily(EncoderFamily):
+    """Self-supervised encoder (wav2vec2/WavLM/HuBERT) with mean pooling and a linear head."""
+
+    cache_item = "ssl_emb"
+    cache_flag = "cache_ssl_embeddings"
+
+    def setup(self, hparams, run_opts) -> None:
+        hparams["ssl_model"] = hparams["ssl_model"].to(device=run_opts["device"])
+        if not hparams["freeze_ssl"] and hparams["freeze_ssl_conv"]:
+            hparams["ssl_model"].model.feature_extractor._freeze_parameters()
+
+    def prepare_caches(self, hparams, datasets, run_opts) -> None:
+        from .dataio import prepare_embedding_caches
+
+        if not hparams["freeze_ssl"]:
+            raise ValueError("cache_ssl_embeddings requires freeze_ssl: true")
+        prepare_embedding_caches(hparams, datasets, run_opts["device"])
+
+    def features(self, modules, hparams, wavs, lens):
+        outputs = modules["ssl_model"](wavs, lens)
+        return hparams["avg_pool"](outputs, lens)
+
+    def classify(self, modules, hparams, feats, lens):
+        outputs = modules["output_mlp"](feats.view(feats.shape[0], -1))
+        return hparams["log_softmax"](outputs)
+
+    def compute_cost(self, hparams, preds, labels, lens):
+        return hparams["compute_cost"](preds, labels.squeeze(1))
+
+    def error_inputs(self, preds, labels, lens):
+        return preds, labels.squeeze(1)
+
+    def init_optimizers(self, brain) -> bool:
+        brain.ssl_optimizer = brain.hparams.ssl_opt_class(brain.modules.ssl_model.parameters())
+        brain.optimizer = brain.hparams.opt_class(brain.hparams.model.parameters())
+        if brain.checkpointer is not None:
+            brain.checkpointer.add_recoverable("ssl_opt", brain.ssl_optimizer)
+            brain.checkpointer.add_recoverable("optimizer", brain.optimizer)
+        brain.optimizers_dict = {
+            "model_optimizer": brain.optimizer,
+            "ssl_optimizer": brain.ssl_optimizer,
+        }
+        return True
+
+    def anneal(self, brain, epoch, stats) -> Dict[str, float]:
+        old_lr, new_lr = brain.hparams.lr_annealing(stats["error_rate"])
+        sb.nnet.schedulers.update_learning_rate(brain.optimizer, new_lr)
+        old_lr_ssl, new_lr_ssl = brain.hparams.lr_annealing_ssl(stats["error_rate"])
+        sb.nnet.schedulers.update_learning_rate(brain.ssl_optimizer, new_lr_ssl)
+        return {"lr": old_lr, "ssl_lr": old_lr_ssl}
+
+
+ENCODER_FAMILIES: Dict[str, Type[EncoderFamily]] = {
+    "xvector": XvectorFamily,
+    "ecapa_tdnn": EcapaFamily,
+    "ssl": SSLFamily,
+}
+
+
+def get_family(hparams) -> EncoderFamily:
+    """Instantiate the family named by ``hparams["encoder_family"]``."""
+    name = hparams.get("encoder_family")
+    if name not in ENCODER_FAMILIES:
+        raise ValueError(
+            f"Unknown encoder_family {name!r}; expected one of {sorted(ENCODER_FAMILIES)}"
+        )
+    return ENCODER_FAMILIES[name]()
@@ -0,0 +1,133 @@
+import copy
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import torch
+import torchaudio
+
+from .encoders import SSLFamily, get_family
+from .runtime import META_FILE
+from .utils import num_classes, peak_normalize
+
+ARTIFACT_VERSION = 1
+# Hyperparameters inference needs besides the modules themselves.
+INFERENCE_HPARAMS = (
+    "encoder_family",
+    "sample_rate",
+    "chunk_duration",
+    "dynamic_batching",
+    "n_classes",
+    "score_scale",
+    "log_softmax",
+    "avg_pool",
+)
+
+
+def quantize_dynamic(modules: Dict[str, torch.nn.Module]) -> Dict[str, torch.nn.Module]:
+    """
+    INT8 dynamic quantization of every ``nn.Linear`` in ``modules`` (on copies).
+
+    Weights are stored as int8 and activations are quantized on the fly, so no
+    calibration data is needed. Convolutions keep float32 weights: PyTorch's
+    dynamic quantization only covers Linear/recurrent layers.
+    """
+    return {
+        name: torch.ao.quantization.quantize_dynamic(
+            copy.deepcopy(module).eval(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        for name, module in modules.items()
+    }
+
+
+def linear_dominated(hparams) -> bool:
+    """
+    Whether :func:`quantize_dynamic` reaches most of the model's compute.
+
+    True for the SSL transformer families. The x-vector and ECAPA-TDNN
+    encoders are mostly Conv1d, which stays float32, so only their small
+    Linear heads would be quantized.
+    """
+    return isinstance(get_family(hparams), SSLFamily)
+
+
+def serialized_mb(modules: Dict[str, torch.nn.Module]) -> float:
+    """Size of the modules' state dicts as ``torch.save`` writes them."""
+    buffer = io.BytesIO()
+    torch.save({name: module.state_dict() for name, module in modules.items()}, buffer)
+    return buffer.tell() / 1024**2
+
+
+def save_artifact(path: Path, hparams, modules, labels: List[str], quantization: str) -> None:
+    """
+    Save a self-contained inference artifact.
+
+    The whole module objects are pickled together with the hyperparameters
+    and labels inference needs, so loading requires neither the YAML, the
+    checkpoint folder nor any hub download.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(
+        {
+            "version": ARTIFACT_VERSION,
+            "quantization": quantization,
+            "labels": list(labels),
+            "hparams": {
+                **{k: hparams[k] for k in INFERENCE_HPARAMS if k in hparams},
+                "n_classes": num_classes(hparams),
+            },
+            "modules": dict(modules),
+        },
+        path,
+    )
+
+
+def load_artifact(path: Path) -> Tuple[Dict, Dict[str, torch.nn.Module], List[str]]:
+    """Return ``(hparams, modules, labels)`` from :func:`save_artifact`."""
+    artifact = torch.load(path, map_location="cpu", weights_only=False)
+    if artifact.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"{path} is not a version {ARTIFACT_VERSION} inference artifact")
+    modules = artifact["modules"]
+    for module in modules.values():
+        module.eval()
+    return artifact["hparams"], modules, artifact["labels"]
+
+
+class InferenceGraph(torch.nn.Module):
+    """
+    Resample → peak-normalise → features → encoder → pooling → probabilities in one module.
+
+    Takes ``[1, num_samples]`` audio at ``input_sample_rate``, which is the
+    shape it is traced with; shorter clips are passed unpadded for
+    ``dynamic_batching`` models, and export verification covers them.
+    """
+
+    def __init__(self, modules: Dict[str, torch.nn.Module], hparams, input_sample_rate: int):
+        super().__init__()
+        self.encoders = torch.nn.ModuleDict(modules)
+        self.hparams = {k: hparams[k] for k in INFERENCE_HPARAMS if k in hparams}
+        self.family = get_family(hparams)
+        if input_sample_rate != hparams["sample_rate"]:
+            self.resample = torchaudio.transforms.Resample(input_sample_rate, hparams["sample_rate"])
+        else:
+            self.resample = torch.nn.Identity()
+
+    def forward(self, wav: torch.Tensor) -> torch.Tensor:
+        wav = peak_normalize(self.resample(wav))
+        lens = torch.ones(wav.shape[0])
+        outputs = self.family.classify_waveforms(self.encoders, self.hparams, wav, lens)
+        return self.family.probabilities(self.hparams, outputs).view(wav.shape[0], -1)
+
+
+def trace_graph(graph: InferenceGraph, num_samples: int) -> torch.jit.ScriptModule:
+    example = torch.randn(1, num_samples) * 0.1
+    with torch.no_grad():
+        return torch.jit.trace(graph.eval(), example, check_trace=False)
+
+
+def save_scripted(path: Path, traced: torch.jit.ScriptModule, meta: Dict) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.jit.save(traced, str(path), _extra_files={META_FILE: json.dumps(meta)})
@@ -0,0 +1,199 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import speechbrain as sb
+import torch
+
+logger = logging.getLogger(__name__)
+
+_SCALAR_TYPES = (bool, int, float, str)
+
+
+def fbank_signature(fbank: torch.nn.Module) -> Dict[str, Dict]:
+    """Scalar configuration of every submodule of a feature extractor."""
+    signature = {}
+    for name, module in fbank.named_modules():
+        signature[name or type(module).__name__] = {
+            k: v
+            for k, v in sorted(vars(module).items())
+            if isinstance(v, _SCALAR_TYPES) and not k.startswith("_") and k != "training"
+        }
+    return signature
+
+
+def cache_key(fbank: torch.nn.Module, hparams, manifest_path: os.PathLike) -> Dict:
+    """Everything that changes the cached features; any difference forces a rebuild."""
+    manifest_path = Path(manifest_path).resolve()
+    return {
+        "fbank": fbank_signature(fbank),
+        "sample_rate": hparams["sample_rate"],
+        "chunk_duration": hparams["chunk_duration"],
+        "manifest": str(manifest_path),
+        "manifest_mtime_ns": manifest_path.stat().st_mtime_ns,
+        # Caches without per-frame peaks cannot normalise crops; rebuild them.
+        "frame_peaks": True,
+    }
+
+
+def _cache_paths(cache_path: Path):
+    cache_path = Path(cache_path)
+    return cache_path.with_suffix(".feats"), cache_path.with_suffix(".json")
+
+
+def _peaks_path(cache_path: Path) -> Path:
+    return Path(cache_path).with_suffix(".peaks")
+
+
+def frame_peaks(sig: torch.Tensor, n_frames: int, hop: int) -> torch.Tensor:
+    """Peak absolute amplitude of each ``hop``-sample block, one per feature frame."""
+    sig = torch.nn.functional.pad(sig.abs(), (0, n_frames * hop - sig.shape[-1]))
+    return sig[: n_frames * hop].view(n_frames, hop).amax(dim=1)
+
+
+def is_fresh(cache_path: Path, key: Dict) -> bool:
+    data_path, meta_path = _cache_paths(cache_path)
+    if not _peaks_path(cache_path).exists():
+        return False
+    if not (data_path.exists() and meta_path.exists()):
+        return False
+    with open(meta_path) as f:
+        # Round-trip through JSON so tuples and lists compare equal.
+        return json.load(f)["key"] == json.loads(json.dumps(key))
+
+
+@torch.no_grad()
+def build_feature_cache(
+    dataset, fbank: torch.nn.Module, cache_path: Path, key: Dict, chunk_samples: int
+) -> None:
+    """
+    Compute features of every full-length utterance once and store them as float16.
+
+    ``dataset`` must provide an uncropped ``full_sig`` item. Frames of all
+    utterances are written back to back; the JSON index stores each
+    utterance's ``[offset, n_frames]`` plus the frame count of one chunk and
+    the feature frame of silence used for padding. A ``.peaks`` file holds
+    the waveform peak under every frame (float32), which
+    :meth:`FeatureStore.random_crop` uses to normalise each crop.
+    """
+    data_path, meta_path = _cache_paths(cache_path)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    fbank = fbank.eval()
+    hop = fbank.compute_STFT.hop_length
+
+    offsets = {}
+    total = 0
+    n_mels = None
+    with open(data_path, "wb") as f, open(_peaks_path(cache_path), "wb") as f_peaks:
+        with dataset.output_keys_as(["id", "full_sig"]):
+            for index in range(len(dataset)):
+                item = dataset[index]
+                feats = fbank(item["full_sig"].unsqueeze(0))[0]
+                arr = feats.cpu().numpy().astype(np.float16)
+                f.write(arr.tobytes())
+                peaks = frame_peaks(item["full_sig"], arr.shape[0], hop)
+                f_peaks.write(peaks.cpu().numpy().astype(np.float32).tobytes())
+                offsets[item["id"]] = [total, int(arr.shape[0])]
+                total += int(arr.shape[0])
+                n_mels = int(arr.shape[1])
+
+    silence = fbank(torch.zeros(1, chunk_samples))[0]
+    meta = {
+        "key": key,
+        "n_mels": n_mels if n_mels is not None else int(silence.shape[1]),
+        "num_frames": total,
+        "chunk_frames": int(silence.shape[0]),
+        "pad_frame": silence[silence.shape[0] // 2].tolist(),
+        "offsets": offsets,
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    logger.info("Cached %d feature frames for %d utterances in %s", total, len(offsets), data_path)
+
+
+class FeatureStore:
+    """
+    Memory-mapped float16 features written by :func:`build_feature_cache`.
+
+    Crops are taken in the feature domain: a random window of
+    ``chunk_frames`` frames, padded with the silence frame when the
+    utterance is shorter (unless ``pad=False``), mirroring
+    ``utils.random_crop`` on waveforms.
+
+    The cached frames come from utterance-normalised audio, while the
+    waveform path and inference peak-normalise each crop. Scaling audio by
+    ``g`` shifts log-mel frames by ``20 * log10(g)`` dB, so each crop is
+    shifted by the inverse of its own peak (from the ``.peaks`` file) to
+    land on approximately the same feature scale. It is not exact: the
+    peak is only resolved per hop at the crop edges, Fbank's ``top_db``
+    floor was taken over the whole utterance rather than the crop, and
+    ``pad_frame`` is the Fbank of digital silence, whereas a padded
+    waveform crop is floored ``top_db`` below its own maximum.
+    """
+
+    def __init__(self, cache_path: Path):
+        self.data_path, meta_path = _cache_paths(cache_path)
+        with open(meta_path) as f:
+            meta = json.load(f)
+        self.n_mels = meta["n_mels"]
+        self.num_frames = meta["num_frames"]
+        self.chunk_frames = meta["chunk_frames"]
+        self.pad_frame = torch.tensor(meta["pad_frame"], dtype=torch.float32)
+        self.offsets = meta["offsets"]
+        self.peaks_path = _peaks_path(cache_path)
+        self._data = None
+        self._peaks = None
+
+    def _mapped(self) -> np.ndarray:
+        if self._data is None:
+            self._data = np.memmap(
+                self.data_path, dtype=np.float16, mode="r", shape=(self.num_frames, self.n_mels)
+            )
+        return self._data
+
+    def _mapped_peaks(self) -> np.ndarray:
+        if self._peaks is None:
+            self._peaks = np.memmap(self.peaks_path, dtype=np.float32, mode="r", shape=(self.num_frames,))
+        return self._peaks
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_data"] = None
+        state["_peaks"] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, utt_id: str) -> torch.Tensor:
+        start, n_frames = self.offsets[utt_id]
+        return torch.from_numpy(self._mapped()[start : start + n_frames].astype(np.float32))
+
+    def random_crop(self, utt_id: str, pad: bool = True) -> torch.Tensor:
+        start, n_frames = self.offsets[utt_id]
+        if n_frames > self.chunk_frames:
+            start += int(torch.randint(0, n_frames - self.chunk_frames + 1, (1,)).item())
+            n_frames = self.chunk_frames
+        feats = torch.from_numpy(self._mapped()[start : start + n_frames].astype(np.float32))
+        peak = float(self._mapped_peaks()[start : start + n_frames].max()) if n_frames else 1.0
+        feats = feats - 20 * np.log10(max(peak, 1e-6))
+        missing = self.chunk_frames - n_frames
+        if pad and missing > 0:
+            feats = torch.cat([feats, self.pad_frame.expand(missing, -1)], dim=0)
+        return feats
+
+
+def attach_feature_store(dataset, cache_path: Path, output_keys, pad: bool = True) -> None:
+    """Expose randomly cropped cached features as the ``feats`` item of ``dataset``."""
+    store = FeatureStore(cache_path)
+
+    @sb.utils.data_pipeline.takes("id")
+    @sb.utils.data_pipeline.provides("feats")
+    def feature_pipeline(utt_id):
+        return store.random_crop(utt_id, pad=pad)
+
+    dataset.add_dynamic_item(feature_pipeline)
+    dataset.set_output_keys(output_keys)
@@ -0,0 +1,114 @@
+import ast
+from pathlib import Path
+
+import torch
+import torchaudio
+from hyperpyyaml import load_hyperpyyaml
+
+from .audio_cache import is_cached_audio, load_cached_audio, load_source_audio
+from .encoders import get_family
+from .utils import random_crop, windowed_scores
+
+DEFAULT_LABELS = ["not_parkinson", "parkinson"]
+
+
+def load_labels(save_folder: Path):
+    """Labels in index order from SpeechBrain's ``label_encoder.txt``."""
+    enc_path = save_folder / "label_encoder.txt"
+    if not enc_path.exists():
+        return DEFAULT_LABELS
+    labels = {}
+    with open(enc_path) as f:
+        for line in f:
+            # Entries ("'label' => index") end at the separator line.
+            if line.startswith("="):
+                break
+            label, sep, index = line.strip().rpartition(" => ")
+            if sep:
+                labels[int(index)] = ast.literal_eval(label)
+    return [labels[i] for i in sorted(labels)] or DEFAULT_LABELS
+
+
+def build_model(hparams_path: Path, checkpoint_dir: Path, data_folder: Path):
+    with open(hparams_path) as fin:
+        hparams = load_hyperpyyaml(fin)
+
+    hparams["data_folder"] = str(data_folder)
+    hparams["checkpointer"].checkpoints_dir = str(checkpoint_dir)
+
+    modules = hparams["modules"]
+    hparams["checkpointer"].recover_if_possible()
+    for module in modules.values():
+        module.eval()
+    return hparams, modules
+
+
+def resample(sig: torch.Tensor, sr: int, hparams) -> torch.Tensor:
+    if sr != hparams["sample_rate"]:
+        sig = torchaudio.functional.resample(
+            sig, orig_freq=sr, new_freq=hparams["sample_rate"]
+        )
+    return sig
+
+
+def pad_crops(hparams) -> bool:
+    """Whether short inputs are zero-padded to ``chunk_duration``, as training does."""
+    return not hparams.get("dynamic_batching", False)
+
+
+def preprocess(sig: torch.Tensor, sr: int, hparams) -> torch.Tensor:
+    """Resample, crop and peak-normalise a mono waveform for the model.
+
+    Short recordings are padded exactly as the training pipeline pads them
+    (see :func:`pad_crops`), so every caller feeds the model the same input
+    for the same file.
+    """
+    sig = resample(sig, sr, hparams)
+    sig = random_crop(sig, hparams["sample_rate"], hparams["chunk_duration"], pad=pad_crops(hparams))
+    sig = sig / torch.clamp(sig.abs().max(), min=1e-6)
+    return sig
+
+
+def load_audio(path: Path, hparams) -> torch.Tensor:
+    """Load a full recording (wav or cached ``.npy``) at the model sample rate."""
+    if is_cached_audio(path):
+        return load_cached_audio(str(path))
+    sig, sr = load_source_audio(path)
+    return resample(sig, sr, hparams)
+
+
+def prepare_audio(path: Path, hparams):
+    return preprocess(load_audio(path, hparams), hparams["sample_rate"], hparams)
+
+
+def collate(sigs):
+    """Zero-pad mono signals into a batch with SpeechBrain relative lengths."""
+    max_len = max(sig.shape[0] for sig in sigs)
+    wavs = torch.zeros(len(sigs), max_len)
+    for i, sig in enumerate(sigs):
+        wavs[i, : sig.shape[0]] = sig
+    lens = torch.tensor([sig.shape[0] / max_len for sig in sigs])
+    return wavs, lens
+
+
+def forward(modules, hparams, wav: torch.Tensor, lens: torch.Tensor = None):
+    """Class probabilities ``[batch, n_classes]`` for a padded batch of waveforms."""
+    if lens is None:
+        lens = torch.ones(wav.shape[0])
+    family = get_family(hparams)
+    outputs = family.classify_waveforms(modules, hparams, wav, lens)
+    probs = family.probabilities(hparams, outputs)
+    return probs.view(wav.shape[0], -1)
+
+
+def score_windowed(modules, hparams, sig: torch.Tensor, hop_duration: float) -> torch.Tensor:
+    """Class probabilities of a full recording from overlapping ``chunk_duration`` windows."""
+    log_probs = windowed_scores(
+        lambda wavs, lens: forward(modules, hparams, wavs, lens).log(),
+        sig.unsqueeze(0),
+        torch.ones(1),
+        hparams["sample_rate"],
+        hparams["chunk_duration"],
+        hop_duration,
+    )
+    return log_probs[0].exp()
@@ -0,0 +1,109 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+import torch
+
+from .audio_cache import from_storage, load_preprocessed, to_storage
+
+PACK_SUFFIX = ".pack"
+INDEX_SUFFIX = ".index.json"
+
+
+def pack_paths(manifest_path: Path) -> Tuple[Path, Path]:
+    """Return the ``(<split>.pack, <split>.index.json)`` pair next to a manifest."""
+    manifest_path = Path(manifest_path)
+    stem = manifest_path.with_suffix("")
+    return stem.with_suffix(PACK_SUFFIX), stem.with_suffix(INDEX_SUFFIX)
+
+
+def pack_manifest(
+    manifest: Dict[str, Dict],
+    manifest_path: Path,
+    data_root: Path,
+    sample_rate: int,
+    dtype: str = "int16",
+) -> Path:
+    """
+    Write every waveform of a manifest into one contiguous file.
+
+    Signals are resampled and peak-normalised as in the ``.npy`` cache, then
+    appended back to back. The index maps each utterance id to its
+    ``[offset, length]`` in samples.
+    """
+    pack_path, index_path = pack_paths(manifest_path)
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_root = pack_path.parent
+
+    offsets: Dict[str, List[int]] = {}
+    offset = 0
+    with open(pack_path, "wb") as f:
+        for utt_id, entry in manifest.items():
+            sig = load_preprocessed(entry["wav"], data_root, cache_root, sample_rate)
+            arr = to_storage(sig, dtype)
+            f.write(arr.tobytes())
+            offsets[utt_id] = [offset, int(arr.shape[0])]
+            offset += int(arr.shape[0])
+
+    index = {
+        "sample_rate": sample_rate,
+        "dtype": dtype,
+        "num_samples": offset,
+        "offsets": offsets,
+    }
+    with open(index_path, "w") as f:
+        json.dump(index, f)
+    return pack_path
+
+
+class PackedWaveforms:
+    """
+    Read-only view over a packed split written by :func:`pack_manifest`.
+
+    The pack is memory-mapped lazily on first access, so instances can be
+    handed to DataLoader workers; each worker maps the file on its own.
+    float32 packs are returned as zero-copy tensors over the mapping, int16
+    packs are scaled to float32 slice by slice.
+    """
+
+    def __init__(self, manifest_path: Path):
+        self.pack_path, self.index_path = pack_paths(manifest_path)
+        if not self.index_path.exists():
+            raise FileNotFoundError(
+                f"No packed audio for {manifest_path}; run scripts/cache_audio.py --format packed."
+            )
+        with open(self.index_path) as f:
+            index = json.load(f)
+        self.sample_rate = index["sample_rate"]
+        self.dtype = np.dtype(index["dtype"])
+        self.num_samples = index["num_samples"]
+        self.offsets = index["offsets"]
+        self._data = None
+
+    def _mapped(self) -> np.ndarray:
+        if self._data is None:
+            # Copy-on-write keeps the mapping writable for torch.from_numpy
+            # without ever touching the file on disk.
+            self._data = np.memmap(
+                self.pack_path, dtype=self.dtype, mode="c", shape=(self.num_samples,)
+            )
+        return self._data
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_data"] = None
+        return state
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, utt_id: str) -> bool:
+        return utt_id in self.offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.offsets)
+
+    def __getitem__(self, utt_id: str) -> torch.Tensor:
+        start, length = self.offsets[utt_id]
+        return from_storage(self._mapped()[start : start + length])
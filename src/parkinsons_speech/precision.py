@@ -0,0 +1,51 @@
+import contextlib
+import logging
+from typing import Optional
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+AUTOCAST_DTYPES = {"fp32": None, "bf16": torch.bfloat16}
+
+
+def _device_type(device) -> str:
+    return torch.device(device).type
+
+
+def bf16_supported(device) -> bool:
+    """Whether autocast to bfloat16 runs on ``device`` (tried with a tiny matmul on CPU)."""
+    device_type = _device_type(device)
+    if device_type == "cuda":
+        return torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+    if device_type != "cpu":
+        return False
+    try:
+        with torch.autocast(device_type="cpu", dtype=torch.bfloat16):
+            out = torch.ones(2, 2) @ torch.ones(2, 2)
+        return out.dtype == torch.bfloat16
+    except RuntimeError:
+        return False
+
+
+def resolve_precision(precision: str, device) -> Optional[torch.dtype]:
+    """
+    Autocast dtype for the ``precision`` hparam, or None for plain float32.
+
+    ``bf16`` falls back to float32 with a warning when the device cannot
+    run bfloat16 autocast.
+    """
+    if precision not in AUTOCAST_DTYPES:
+        raise ValueError(f"Unknown precision {precision!r}; expected one of {sorted(AUTOCAST_DTYPES)}")
+    dtype = AUTOCAST_DTYPES[precision]
+    if dtype is torch.bfloat16 and not bf16_supported(device):
+        logger.warning("bfloat16 autocast is not available on %s; training in float32", device)
+        return None
+    return dtype
+
+
+def autocast(device, dtype: Optional[torch.dtype]):
+    """Autocast context for ``dtype`` on ``device``; a no-op when ``dtype`` is None."""
+    if dtype is None:
+        return contextlib.nullcontext()
+    return torch.autocast(device_type=_device_type(device), dtype=dtype)
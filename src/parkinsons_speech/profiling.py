@@ -0,0 +1,171 @@
+"""
+Opt-in training instrumentation (``profile: true``).
+
+:class:`StageProfiler` times the training loop stages, data pipeline work
+and checkpointing per epoch and writes a table to the train log;
+:class:`TraceWindow` records a ``torch.profiler`` trace of a few steps.
+"""
+import contextlib
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import torch
+
+
+def write_table(path: Path, lines: List[str]) -> None:
+    """Append profile table lines to a train log."""
+    with open(path, "a") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (DataLoader workers excluded)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+class StageProfiler:
+    """
+    Per-stage wall time, audio throughput and peak memory for one epoch.
+
+    Training-loop stages are timed with :meth:`section` in the main process;
+    on CUDA each section synchronizes first so the time lands on the stage
+    that queued the kernels. Data pipeline stages arrive per utterance via
+    :meth:`add_pipeline` and are summed over all workers, so they are CPU
+    seconds spent in the pipeline rather than wall time.
+
+    Every stage is recorded under the current :attr:`phase` (``train``,
+    ``valid``, ...), so the same stage of different phases gets its own
+    row. Throughput counts the audio of :meth:`add_batch` calls only, which
+    the Brain makes for training batches.
+    """
+
+    def __init__(self, device="cpu"):
+        self.sync = str(device).startswith("cuda") and torch.cuda.is_available()
+        self.reset()
+
+    def reset(self) -> None:
+        self.phase = "train"
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._section_s = 0.0
+        self.audio_s = 0.0
+        self.batches = 0
+        self._start = time.perf_counter()
+
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        stage = f"{self.phase}/{stage}"
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+        self.counts[stage] = self.counts.get(stage, 0) + count
+
+    @contextlib.contextmanager
+    def section(self, stage: str):
+        if self.sync:
+            torch.cuda.synchronize()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.sync:
+                torch.cuda.synchronize()
+            elapsed = time.perf_counter() - start
+            self._section_s += elapsed
+            self.add(stage, elapsed)
+
+    @contextlib.contextmanager
+    def remainder(self, stage: str):
+        """Time a block minus what the :meth:`section` calls nested in it recorded."""
+        nested = self._section_s
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.sync:
+                torch.cuda.synchronize()
+            self.add(stage, time.perf_counter() - start - (self._section_s - nested))
+
+    def add_pipeline(self, timings: Optional[Iterable[Dict[str, float]]]) -> None:
+        """Add the per-utterance ``pipeline_timing`` dicts of one batch (see ``dataio_prep``)."""
+        for timing in timings or ():
+            for stage, seconds in timing.items():
+                self.add(stage, seconds)
+
+    def add_batch(self, audio_s: float) -> None:
+        self.audio_s += audio_s
+        self.batches += 1
+
+    def summary(self) -> Dict[str, float]:
+        """Headline numbers for the train logger line."""
+        wall = time.perf_counter() - self._start
+        stats = {
+            "audio_s_per_s": round(self.audio_s / wall, 1) if wall else 0.0,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        }
+        if torch.cuda.is_available():
+            stats["peak_cuda_mb"] = round(torch.cuda.max_memory_allocated() / 1024**2, 1)
+        return stats
+
+    def table(self, title: str) -> List[str]:
+        """
+        Fixed-width per-stage table for the train log.
+
+        Lines start with ``profile |`` and contain no ``key: value`` pairs, so
+        :func:`parkinsons_speech.sweep.parse_train_log` skips them.
+        """
+        wall = time.perf_counter() - self._start
+        lines = [
+            f"profile | {title} | wall {wall:.2f} s | {self.batches} batches | "
+            f"{self.audio_s:.1f} s audio",
+            f"profile | {'stage':<22} | {'total_s':>9} | {'calls':>8} | {'mean_ms':>9} | {'share':>6}",
+        ]
+        for stage, total in sorted(self.totals.items(), key=lambda kv: -kv[1]):
+            calls = self.counts[stage]
+            lines.append(
+                f"profile | {stage:<22} | {total:9.3f} | {calls:8d} | "
+                f"{1000 * total / calls:9.3f} | {total / wall if wall else 0.0:6.1%}"
+            )
+        return lines
+
+
+class TraceWindow:
+    """
+    ``torch.profiler`` trace of a window of training steps.
+
+    Skips ``wait`` steps, warms up for one and records ``active`` steps,
+    then writes a TensorBoard/Chrome trace to ``folder`` and stops. Only
+    the first window is traced, however many epochs follow.
+    """
+
+    def __init__(self, folder: Path, wait: int, active: int):
+        from torch.profiler import ProfilerActivity, profile, schedule, tensorboard_trace_handler
+
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        Path(folder).mkdir(parents=True, exist_ok=True)
+        self.steps_left = wait + 1 + active
+        self.profiler = profile(
+            activities=activities,
+            schedule=schedule(wait=wait, warmup=1, active=active, repeat=1),
+            on_trace_ready=tensorboard_trace_handler(str(folder)),
+            record_shapes=True,
+            profile_memory=True,
+        )
+        self.profiler.start()
+
+    def step(self) -> None:
+        if self.profiler is None:
+            return
+        self.profiler.step()
+        self.steps_left -= 1
+        if self.steps_left <= 0:
+            self.stop()
+
+    def stop(self) -> None:
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler = None
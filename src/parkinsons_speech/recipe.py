@@ -0,0 +1,66 @@
+import sys
+
+import speechbrain as sb
+import torch
+from hyperpyyaml import load_hyperpyyaml
+
+from .batching import loader_options
+from .brain import ParkinsonBrain
+from .dataio import dataio_prep
+from .encoders import get_family
+
+
+def run(argv=None):
+    """Train and evaluate the recipe described by a HyperPyYAML file (``train.py`` CLI)."""
+    hparams_file, run_opts, overrides = sb.parse_arguments(
+        sys.argv[1:] if argv is None else argv
+    )
+    sb.utils.distributed.ddp_init_group(run_opts)
+    if str(run_opts.get("device", "")).startswith("cuda") and not torch.cuda.is_available():
+        run_opts["device"] = "cpu"
+
+    with open(hparams_file) as fin:
+        hparams = load_hyperpyyaml(fin, overrides)
+    family = get_family(hparams)
+    if hparams.get("num_threads"):
+        torch.set_num_threads(int(hparams["num_threads"]))
+
+    sb.create_experiment_directory(
+        experiment_directory=hparams["output_folder"],
+        hyperparams_to_save=hparams_file,
+        overrides=overrides,
+    )
+
+    datasets = dataio_prep(hparams)
+    family.setup(hparams, run_opts)
+    if family.cache_enabled(hparams):
+        family.prepare_caches(hparams, datasets, run_opts)
+    if hparams["windowed_eval"]:
+        datasets["test"].set_output_keys(["id", "full_sig", "label_encoded"])
+
+    train_loader_opts = loader_options(hparams, datasets["train"], train=True)
+    valid_loader_opts = loader_options(hparams, datasets["valid"])
+    test_loader_opts = loader_options(hparams, datasets["test"])
+    hparams["train_sampler"] = train_loader_opts.get("batch_sampler")
+
+    brain = ParkinsonBrain(
+        modules=hparams["modules"],
+        opt_class=hparams["opt_class"],
+        hparams=hparams,
+        run_opts=run_opts,
+        checkpointer=hparams["checkpointer"],
+    )
+
+    brain.fit(
+        epoch_counter=brain.hparams.epoch_counter,
+        train_set=datasets["train"],
+        valid_set=datasets["valid"],
+        train_loader_kwargs=train_loader_opts,
+        valid_loader_kwargs=valid_loader_opts,
+    )
+    brain.evaluate(
+        test_set=datasets["test"],
+        min_key="error_rate",
+        test_loader_kwargs=test_loader_opts,
+    )
+    return brain
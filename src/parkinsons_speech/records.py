@@ -0,0 +1,133 @@
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from .data_prep import Record, iter_manifest
+
+
+def _encode(codes: array, vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Remap first-seen codes so that ``categories`` is sorted; returns ``(categories, codes)``."""
+    names = np.array(list(vocab), dtype=object)
+    order = np.argsort(names, kind="stable")
+    remap = np.empty(len(names), dtype=np.int32)
+    remap[order] = np.arange(len(names), dtype=np.int32)
+    return names[order], remap[np.frombuffer(codes, dtype=np.int32)]
+
+
+@dataclass
+class RecordTable:
+    """
+    Columnar view of scanned records.
+
+    Speakers and labels are stored as ``int32`` codes into sorted category
+    arrays. Durations are kept twice: ``duration`` (``float32``) feeds the
+    split arithmetic, and ``length`` (``float64``) is the exact
+    ``num_frames / sample_rate`` value written back to manifests. Splitting, summaries and overlap checks
+    work on these arrays instead of lists of
+    :class:`~parkinsons_speech.data_prep.Record` objects; rows are only
+    turned back into manifest entries while a split is being written.
+    Tables produced by :meth:`take` share their parent's categories, so
+    codes are comparable across the splits of one table.
+    """
+
+    utt_id: np.ndarray
+    wav: np.ndarray
+    speaker_codes: np.ndarray
+    label_codes: np.ndarray
+    duration: np.ndarray
+    length: np.ndarray
+    speakers: np.ndarray
+    labels: np.ndarray
+
+    @classmethod
+    def from_records(cls, records: Iterable[Record]) -> "RecordTable":
+        utt_id: List[str] = []
+        wav: List[str] = []
+        speaker_codes, label_codes = array("i"), array("i")
+        duration = array("f")
+        length = array("d")
+        speaker_vocab: Dict[str, int] = {}
+        label_vocab: Dict[str, int] = {}
+        for rec in records:
+            utt_id.append(rec.utt_id)
+            wav.append(rec.wav)
+            speaker_codes.append(speaker_vocab.setdefault(rec.speaker, len(speaker_vocab)))
+            label_codes.append(label_vocab.setdefault(rec.label, len(label_vocab)))
+            duration.append(rec.duration)
+            length.append(rec.duration)
+        speakers, speaker_codes = _encode(speaker_codes, speaker_vocab)
+        labels, label_codes = _encode(label_codes, label_vocab)
+        return cls(
+            utt_id=np.array(utt_id, dtype=object),
+            wav=np.array(wav, dtype=object),
+            speaker_codes=speaker_codes,
+            label_codes=label_codes,
+            duration=np.frombuffer(duration, dtype=np.float32).copy(),
+            length=np.frombuffer(length, dtype=np.float64).copy(),
+            speakers=speakers,
+            labels=labels,
+        )
+
+    @classmethod
+    def from_manifest(cls, path: Path) -> "RecordTable":
+        """Read a ``.json``/``.jsonl`` manifest row by row into a table."""
+        return cls.from_records(
+            Record(
+                utt_id=utt_id,
+                wav=entry["wav"],
+                speaker=entry["speaker"],
+                label=entry["label"],
+                duration=entry["length"],
+            )
+            for utt_id, entry in iter_manifest(path)
+        )
+
+    def __len__(self) -> int:
+        return len(self.utt_id)
+
+    @property
+    def speaker(self) -> np.ndarray:
+        """Decoded speaker of every row."""
+        return self.speakers[self.speaker_codes]
+
+    @property
+    def label(self) -> np.ndarray:
+        """Decoded label of every row."""
+        return self.labels[self.label_codes]
+
+    def take(self, idx: np.ndarray) -> "RecordTable":
+        """Rows ``idx`` as a new table sharing this table's categories."""
+        return RecordTable(
+            utt_id=self.utt_id[idx],
+            wav=self.wav[idx],
+            speaker_codes=self.speaker_codes[idx],
+            label_codes=self.label_codes[idx],
+            duration=self.duration[idx],
+            length=self.length[idx],
+            speakers=self.speakers,
+            labels=self.labels,
+        )
+
+    def rows(self) -> Iterator[Tuple[str, Dict]]:
+        """
+        ``(utt_id, entry)`` manifest rows, as :func:`~parkinsons_speech.data_prep.write_manifest` takes them.
+
+        ``length`` is the original float64 duration, so manifests are the same
+        as the list-of-records path wrote and stay exact to the frame.
+        """
+        for utt_id, wav, speaker, label, length in zip(
+            self.utt_id,
+            self.wav,
+            self.speaker_codes.tolist(),
+            self.label_codes.tolist(),
+            self.length.tolist(),
+        ):
+            yield utt_id, {
+                "wav": wav,
+                "length": length,
+                "label": self.labels[label],
+                "speaker": self.speakers[speaker],
+            }
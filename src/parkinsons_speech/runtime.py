@@ -0,0 +1,63 @@
+"""
+Standalone runtime for TorchScript graphs written by ``scripts/export_torchscript.py``.
+
+Only torch and torchaudio are needed here, so loading a scripted model does
+not import speechbrain or HyperPyYAML.
+"""
+import json
+from pathlib import Path
+from typing import List
+
+import torch
+import torchaudio
+
+from .audio_cache import is_cached_audio, load_cached_audio, load_source_audio
+
+META_FILE = "meta.json"
+
+
+class ScriptedModel:
+    """
+    A traced resample → normalise → encoder → probabilities graph.
+
+    The graph was traced on a single clip of ``num_samples`` samples at
+    ``input_sample_rate``; longer recordings are randomly cropped to that
+    length and shorter ones zero-padded, unless the model was trained with
+    ``dynamic_batching`` (meta ``pad: false``), in which case they are
+    scored at their own length, as in training.
+    """
+
+    def __init__(self, path: Path):
+        extra_files = {META_FILE: ""}
+        self.module = torch.jit.load(str(path), map_location="cpu", _extra_files=extra_files)
+        self.module.eval()
+        meta = json.loads(extra_files[META_FILE])
+        self.labels: List[str] = meta["labels"]
+        self.input_sample_rate: int = meta["input_sample_rate"]
+        self.num_samples: int = meta["num_samples"]
+        # Graphs exported before the flag was stored always padded.
+        self.pad: bool = meta.get("pad", True)
+        self.meta = meta
+
+    def load(self, path: Path) -> torch.Tensor:
+        """Mono waveform at the graph's input rate."""
+        if is_cached_audio(path):
+            sig, sr = load_cached_audio(str(path)), self.meta["sample_rate"]
+        else:
+            sig, sr = load_source_audio(Path(path))
+        if sr != self.input_sample_rate:
+            sig = torchaudio.functional.resample(sig, orig_freq=sr, new_freq=self.input_sample_rate)
+        return sig
+
+    def crop(self, sig: torch.Tensor) -> torch.Tensor:
+        if sig.shape[-1] > self.num_samples:
+            start = int(torch.randint(0, sig.shape[-1] - self.num_samples + 1, (1,)).item())
+            return sig[start : start + self.num_samples]
+        if not self.pad:
+            return sig
+        return torch.nn.functional.pad(sig, (0, self.num_samples - sig.shape[-1]))
+
+    @torch.inference_mode()
+    def __call__(self, sig: torch.Tensor) -> torch.Tensor:
+        """Class probabilities for one mono clip at ``input_sample_rate``."""
+        return self.module(self.crop(sig).unsqueeze(0))[0]
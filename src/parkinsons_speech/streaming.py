@@ -0,0 +1,271 @@
+"""
+Streaming scoring for the Fbank families (xvector, ECAPA-TDNN).
+
+:class:`StreamingScorer` takes audio chunks as they arrive and emits an
+updated probability every ``emit_ms`` over the last ``window_s`` seconds.
+Fbank frames are computed once, from the new samples plus the STFT
+overlap, and kept in a :class:`FrameRing`. For x-vectors the frame-level
+TDNN outputs are cached as well, so an update only runs the TDNN on new
+frames before pooling. ECAPA-TDNN has utterance-level squeeze-excitation
+and attentive pooling, so its encoder reruns on the window each update;
+that work is bounded by the window, not by the stream length.
+"""
+import math
+import time
+from typing import List, NamedTuple, Optional
+
+import torch
+
+from .encoders import SSLFamily, XvectorFamily, get_family
+
+
+class StreamUpdate(NamedTuple):
+    time_s: float  # stream time of the newest sample scored
+    window_s: float  # audio covered by the score
+    probs: torch.Tensor
+    latency_ms: float  # processing time of the chunk that triggered the update
+
+
+class FrameRing:
+    """
+    The last ``size`` rows of an append-only ``[frames, dim]`` stream.
+
+    Rows live in a buffer of twice the size; when it fills up the newest
+    ``size`` rows are copied to the front, so appends are amortised O(1)
+    and :meth:`since` always returns a contiguous view.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffer: Optional[torch.Tensor] = None
+        self.fill = 0
+        self.total = 0  # rows ever appended; global index of the next row
+
+    @property
+    def first(self) -> int:
+        """Global index of the oldest row still held."""
+        return self.total - min(self.fill, self.size)
+
+    def append(self, rows: torch.Tensor) -> None:
+        count = len(rows)
+        rows = rows[-self.size :]
+        if self.buffer is None:
+            self.buffer = rows.new_zeros(2 * self.size, rows.shape[1])
+        if self.fill + len(rows) > len(self.buffer):
+            keep = min(self.fill, self.size - len(rows))
+            self.buffer[:keep] = self.buffer[self.fill - keep : self.fill].clone()
+            self.fill = keep
+        self.buffer[self.fill : self.fill + len(rows)] = rows
+        self.fill += len(rows)
+        self.total += count
+
+    def since(self, index: int) -> torch.Tensor:
+        """Rows from global ``index`` (clamped to :attr:`first`) to the newest."""
+        if self.buffer is None:
+            return torch.zeros(0, 0)
+        start = max(index, self.first)
+        return self.buffer[self.fill - (self.total - start) : self.fill]
+
+    def clear(self) -> None:
+        self.fill = 0
+        self.total = 0
+
+
+class _XvectorFrames:
+    """Frame-level TDNN outputs of an x-vector, cached per frame."""
+
+    def __init__(self, xvector, size: int):
+        layers = list(xvector.blocks)
+        split = next(i for i, layer in enumerate(layers) if type(layer).__name__ == "StatisticsPooling")
+        self.frame_layers = layers[:split]
+        self.pooling = layers[split]
+        self.head = layers[split + 1 :]
+        # "same" convolutions: each output frame needs this many input frames per side.
+        self.context = sum(
+            layer.dilation * (layer.kernel_size - 1) // 2
+            for layer in self.frame_layers
+            if hasattr(layer, "kernel_size")
+        )
+        self.outputs = FrameRing(size)
+
+    def _run(self, feats: torch.Tensor) -> torch.Tensor:
+        x = feats.unsqueeze(0)
+        for layer in self.frame_layers:
+            x = layer(x)
+        return x[0]
+
+    def update(self, feats: FrameRing) -> None:
+        """Compute outputs for new frames whose right context has arrived."""
+        ready = feats.total - self.context
+        if self.outputs.total < feats.first:
+            self.outputs.clear()
+            self.outputs.total = feats.first
+        start = self.outputs.total
+        if ready <= start:
+            return
+        first = max(feats.first, start - self.context)
+        segment = feats.since(first)[: ready + self.context - first]
+        self.outputs.append(self._run(segment)[start - first : ready - first])
+
+    def embed(self, feats: FrameRing, frames: int) -> torch.Tensor:
+        """Embedding of the last ``frames`` frames: cached outputs plus the unfinished tail."""
+        parts = []
+        if self.outputs.total > self.outputs.first:
+            parts.append(self.outputs.since(feats.total - frames))
+        if self.context:
+            tail_start = max(feats.first, feats.total - 2 * self.context)
+            parts.append(self._run(feats.since(tail_start))[self.outputs.total - tail_start :])
+        outputs = torch.cat(parts)[-frames:]
+        x = self.pooling(outputs.unsqueeze(0))
+        for layer in self.head:
+            x = layer(x)
+        return x
+
+
+class StreamingScorer:
+    """
+    Score a live audio stream with a trained xvector or ECAPA-TDNN model.
+
+    Chunks passed to :meth:`push` must already be at ``hparams["sample_rate"]``.
+    Every ``emit_ms`` of new audio, once ``min_s`` seconds have arrived, the
+    last ``window_s`` seconds (default ``chunk_duration``) are scored.
+
+    Offline inference peak-normalises each crop. Here frames are computed
+    on the raw audio and shifted in the log-mel domain by the running peak
+    of the stream, which equals that scaling once the loudest sample has
+    arrived. Cached x-vector outputs are recomputed when the running peak
+    rises by more than ``peak_tolerance_db``. Scores match an offline pass
+    over the same window except for frames near the window start (which
+    see real context instead of padding) and Fbank's ``top_db`` floor,
+    which is taken per computed segment.
+    """
+
+    def __init__(
+        self,
+        modules,
+        hparams,
+        emit_ms: float = 500.0,
+        window_s: Optional[float] = None,
+        min_s: float = 1.0,
+        peak_tolerance_db: float = 1.0,
+    ):
+        self.family = get_family(hparams)
+        if isinstance(self.family, SSLFamily):
+            raise ValueError("Streaming supports the Fbank families (xvector, ecapa_tdnn) only")
+        self.modules = modules
+        self.hparams = hparams
+        self.fbank = modules[self.family.feature_module]
+        if self.fbank.deltas or self.fbank.context:
+            raise ValueError("Streaming needs an Fbank without deltas or context frames")
+        stft = self.fbank.compute_STFT
+        self.hop = stft.hop_length
+        self.half_window = stft.n_fft // 2 if stft.center else 0
+        self.sample_rate = hparams["sample_rate"]
+        window_s = window_s if window_s is not None else hparams["chunk_duration"]
+        self.window_frames = max(1, int(window_s * self.sample_rate / self.hop))
+        self.emit_samples = max(1, int(emit_ms * self.sample_rate / 1000))
+        self.min_frames = max(1, int(min_s * self.sample_rate / self.hop))
+        self.peak_tolerance_db = peak_tolerance_db
+        self.xvector = None
+        if type(self.family) is XvectorFamily:
+            self.xvector = _XvectorFrames(modules[self.family.embedding_module], self.window_frames)
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new stream."""
+        # Keep enough Fbank frames for the window plus the x-vector context.
+        context = self.xvector.context if self.xvector is not None else 0
+        self.frames = FrameRing(self.window_frames + 2 * context)
+        if self.xvector is not None:
+            self.xvector.outputs.clear()
+        self.pending = torch.zeros(0)
+        self.pending_start = 0  # stream index of pending[0]
+        self.received = 0
+        self.since_emit = 0
+        self.peak = 0.0
+        self.offset_peak = 0.0  # peak the cached x-vector outputs were computed with
+
+    def _log_peak(self) -> float:
+        return 20 * math.log10(max(self.peak, 1e-6))
+
+    def _compute_frames(self, final: bool) -> None:
+        """Fbank frames that no longer depend on future samples (all of them when ``final``)."""
+        next_frame = self.frames.total
+        # Frames in the computed segment are aligned with the stream's frames.
+        lead = math.ceil(self.half_window / self.hop)
+        start = max(0, next_frame - lead) * self.hop
+        sig = self.pending[start - self.pending_start :]
+        if final:
+            last = start // self.hop + len(sig) // self.hop
+        else:
+            last = (self.received - self.half_window) // self.hop
+        if last < next_frame or len(sig) <= self.half_window:
+            return
+        feats = self.fbank(sig.unsqueeze(0))[0]
+        first_local = next_frame - start // self.hop
+        self.frames.append(feats[first_local : last - start // self.hop + 1])
+        # Drop the samples no future frame needs.
+        keep_from = max(0, self.frames.total - lead) * self.hop
+        self.pending = self.pending[keep_from - self.pending_start :]
+        self.pending_start = keep_from
+
+    def _score(self, latency_start: float) -> StreamUpdate:
+        frames = min(self.window_frames, self.frames.total)
+        shift = self._log_peak()
+        if self.xvector is not None:
+            if shift - 20 * math.log10(max(self.offset_peak, 1e-6)) > self.peak_tolerance_db:
+                self.xvector.outputs.clear()
+                self.offset_peak = self.peak
+            offset = 20 * math.log10(max(self.offset_peak, 1e-6))
+            shifted = _ShiftedRing(self.frames, offset)
+            self.xvector.update(shifted)
+            embeddings = self.xvector.embed(shifted, frames)
+            outputs = self.hparams["log_softmax"](self.modules["classifier"](embeddings))
+        else:
+            feats = (self.frames.since(self.frames.total - frames) - shift).unsqueeze(0)
+            outputs = self.family.classify(self.modules, self.hparams, feats, torch.ones(1))
+        probs = self.family.probabilities(self.hparams, outputs).view(-1)
+        return StreamUpdate(
+            time_s=self.received / self.sample_rate,
+            window_s=frames * self.hop / self.sample_rate,
+            probs=probs,
+            latency_ms=1000 * (time.perf_counter() - latency_start),
+        )
+
+    @torch.inference_mode()
+    def push(self, chunk: torch.Tensor) -> List[StreamUpdate]:
+        """Add a mono chunk; return the updates it triggered (at most one)."""
+        start = time.perf_counter()
+        chunk = chunk.reshape(-1).float()
+        if chunk.numel():
+            self.peak = max(self.peak, float(chunk.abs().max()))
+        self.pending = torch.cat([self.pending, chunk])
+        self.received += chunk.numel()
+        self.since_emit += chunk.numel()
+        self._compute_frames(final=False)
+        if self.since_emit < self.emit_samples or self.frames.total < self.min_frames:
+            return []
+        self.since_emit = 0
+        return [self._score(start)]
+
+    @torch.inference_mode()
+    def flush(self) -> Optional[StreamUpdate]:
+        """Score the end of the stream, including its last frames; :meth:`reset` before reuse."""
+        start = time.perf_counter()
+        self._compute_frames(final=True)
+        if self.frames.total == 0:
+            return None
+        return self._score(start)
+
+
+class _ShiftedRing:
+    """Read-only view of a :class:`FrameRing` with a log-peak offset subtracted."""
+
+    def __init__(self, ring: FrameRing, offset: float):
+        self.ring = ring
+        self.offset = offset
+        self.first = ring.first
+        self.total = ring.total
+
+    def since(self, index: int) -> torch.Tensor:
+        return self.ring.since(index) - self.offset
@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Jobs run from the repo root, where the recipes' ``project_root: .`` (manifests,
+# results) resolves, whatever the caller's working directory.
+REPO_ROOT = Path(__file__).resolve().parents[2]
+TRAIN_SCRIPT = REPO_ROOT / "recipes" / "parkinsons_binary" / "train.py"
+# Rough peak resident memory of one CPU training job, in GiB, per encoder family.
+DEFAULT_JOB_MEMORY_GB = {"xvector": 2.0, "ecapa_tdnn": 3.0, "ssl": 8.0}
+
+_FAMILY_RE = re.compile(r"^encoder_family:\s*(\S+)", re.MULTILINE)
+
+
+@dataclass
+class Job:
+    model: str
+    seed: int
+    hparams: Path
+    output_folder: Path
+    memory_gb: float
+    # Prefix of the job name (e.g. a CV fold) and recipe arguments for this job only.
+    label: str = ""
+    extra_args: List[str] = field(default_factory=list)
+    status: str = "pending"
+    returncode: Optional[int] = None
+    wall_s: Optional[float] = None
+    metrics: Dict = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.label}_{self.model}_{self.seed}" if self.label else f"{self.model}_{self.seed}"
+
+    @property
+    def train_log(self) -> Path:
+        return self.output_folder / "train_log.txt"
+
+
+def encoder_family(hparams_path: Path) -> str:
+    """Read ``encoder_family`` from a recipe YAML without instantiating its objects."""
+    match = _FAMILY_RE.search(Path(hparams_path).read_text())
+    return match.group(1) if match else ""
+
+
+def make_jobs(
+    recipes_dir: Path,
+    models: List[str],
+    seeds: List[int],
+    output_root: Path,
+    job_memory_gb: Dict[str, float],
+    label: str = "",
+    extra_args: Optional[List[str]] = None,
+) -> List[Job]:
+    jobs = []
+    for model in models:
+        hparams = Path(recipes_dir) / model / "hparams" / "train.yaml"
+        if not hparams.exists():
+            raise FileNotFoundError(f"No recipe YAML for {model!r} at {hparams}")
+        family = encoder_family(hparams)
+        memory = job_memory_gb.get(model, job_memory_gb.get(family, DEFAULT_JOB_MEMORY_GB.get(family, 4.0)))
+        for seed in seeds:
+            jobs.append(
+                Job(
+                    model=model,
+                    seed=seed,
+                    hparams=hparams,
+                    output_folder=Path(output_root) / model / str(seed),
+                    memory_gb=float(memory),
+                    label=label,
+                    extra_args=list(extra_args or []),
+                )
+            )
+    return jobs
+
+
+def parse_train_log(path: Path) -> Dict:
+    """
+    Metrics from a SpeechBrain ``FileTrainLogger`` file.
+
+    Returns the last epoch's stats, the best validation error rate and the
+    test stats (present once the run has finished).
+    """
+    metrics: Dict = {}
+    if not Path(path).exists():
+        return metrics
+    best_valid = None
+    with open(path) as f:
+        for line in f:
+            stats = {}
+            for part in line.strip().split(" - "):
+                for item in part.split(", "):
+                    key, sep, value = item.rpartition(": ")
+                    if not sep:
+                        continue
+                    try:
+                        stats[key] = float(value)
+                    except ValueError:
+                        stats[key] = value
+            if "Epoch loaded" in stats:
+                metrics["test"] = {k[5:]: v for k, v in stats.items() if k.startswith("test ")}
+                metrics["epoch_loaded"] = stats["Epoch loaded"]
+            elif "epoch" in stats or "Epoch" in stats:
+                metrics["epochs"] = stats.get("epoch", stats.get("Epoch"))
+                metrics["last"] = stats
+                error = stats.get("valid error_rate")
+                if isinstance(error, float) and (best_valid is None or error < best_valid):
+                    best_valid = error
+    if best_valid is not None:
+        metrics["best_valid_error_rate"] = best_valid
+    return metrics
+
+
+def is_complete(job: Job) -> bool:
+    """A run is finished once its test stats are logged; anything else is resumed."""
+    return "test" in parse_train_log(job.train_log)
+
+
+def job_command(job: Job, data_folder: str, threads: int, workers: int, device: str, extra: List[str]):
+    # Recipe YAMLs place runs under <output_root>/<model>/<seed>. Paths are made
+    # absolute because the job runs from REPO_ROOT, not the caller's directory.
+    return [
+        sys.executable,
+        str(TRAIN_SCRIPT),
+        str(Path(job.hparams).resolve()),
+        "--data_folder", str(Path(data_folder).resolve()),
+        "--seed", str(job.seed),
+        "--output_root", str(job.output_folder.parent.parent.resolve()),
+        "--num_threads", str(threads),
+        "--num_workers", str(workers),
+        "--device", device,
+        *job.extra_args,
+        *extra,
+    ]
+
+
+def thread_env(threads: int) -> Dict[str, str]:
+    """Environment capping every BLAS/OpenMP pool of a child to ``threads``."""
+    env = dict(os.environ)
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        env[var] = str(threads)
+    return env
+
+
+def run_sweep(
+    jobs: List[Job],
+    data_folder: str,
+    log_dir: Path,
+    total_threads: int,
+    threads_per_job: int,
+    memory_gb: float,
+    workers_per_job: int = 1,
+    device: str = "cpu",
+    extra_args: Optional[List[str]] = None,
+    force: bool = False,
+    poll_s: float = 1.0,
+) -> List[Job]:
+    """
+    Run jobs concurrently within a thread and memory budget.
+
+    A job starts when ``threads_per_job`` threads and its estimated memory
+    are free; smaller jobs may start ahead of a larger one that does not fit
+    yet. A job larger than the whole memory budget runs alone. Finished runs
+    (test stats in their train log) are skipped; with ``force`` their output
+    folder is deleted first so they train from scratch instead of the
+    checkpointer recovering the finished run. Interrupted runs restart with the same output folder, so SpeechBrain's checkpointer
+    resumes them from the last saved epoch.
+    """
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    extra_args = list(extra_args or [])
+    threads_per_job = max(1, min(threads_per_job, total_threads))
+
+    pending = []
+    for job in jobs:
+        if is_complete(job):
+            if not force:
+                job.status = "skipped"
+                job.metrics = parse_train_log(job.train_log)
+                continue
+            logger.info("Removing %s to re-run %s from scratch", job.output_folder, job.name)
+            shutil.rmtree(job.output_folder)
+        pending.append(job)
+
+    running = {}
+    try:
+        while pending or running:
+            used_threads = threads_per_job * len(running)
+            used_memory = sum(job.memory_gb for job in running.values())
+            for job in list(pending):
+                if used_threads + threads_per_job > total_threads:
+                    break
+                fits = used_memory + job.memory_gb <= memory_gb
+                if not fits and running:
+                    continue
+                if not fits:
+                    logger.warning(
+                        "%s needs %.1f GiB, more than the %.1f GiB budget; running it alone",
+                        job.name, job.memory_gb, memory_gb,
+                    )
+                cmd = job_command(job, data_folder, threads_per_job, workers_per_job, device, extra_args)
+                log_file = open(log_dir / f"{job.name}.log", "a")
+                proc = subprocess.Popen(
+                    cmd,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    env=thread_env(threads_per_job),
+                    cwd=REPO_ROOT,
+                )
+                proc.log_file = log_file
+                proc.started = time.perf_counter()
+                job.status = "running"
+                running[proc] = job
+                pending.remove(job)
+                used_threads += threads_per_job
+                used_memory += job.memory_gb
+                logger.info("Started %s (%d threads, %.1f GiB)", job.name, threads_per_job, job.memory_gb)
+                if not fits:
+                    break
+
+            time.sleep(poll_s)
+            for proc in [p for p in running if p.poll() is not None]:
+                job = running.pop(proc)
+                proc.log_file.close()
+                job.returncode = proc.returncode
+                job.wall_s = round(time.perf_counter() - proc.started, 1)
+                job.status = "done" if proc.returncode == 0 else "failed"
+                job.metrics = parse_train_log(job.train_log)
+                logger.info("%s %s after %.1fs", job.name, job.status, job.wall_s)
+    except KeyboardInterrupt:
+        for proc, job in running.items():
+            proc.terminate()
+            proc.wait()
+            proc.log_file.close()
+            job.status = "interrupted"
+            job.wall_s = round(time.perf_counter() - proc.started, 1)
+            job.metrics = parse_train_log(job.train_log)
+        raise
+    return jobs
+
+
+def write_summary(jobs: List[Job], path: Path) -> None:
+    rows = []
+    for job in jobs:
+        row = asdict(job)
+        row["hparams"] = str(job.hparams)
+        row["output_folder"] = str(job.output_folder)
+        rows.append(row)
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2)
@@ -1,18 +1,30 @@
+"""
+Small helpers shared by the scripts and recipes.
+
+numpy, torch and speechbrain are imported inside the functions that need
+them, so CLI entry points that only use the path and CPU helpers start
+without loading them.
+"""
+from __future__ import annotations
+
 import logging
+import math
 import os
 import random
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
 
-import numpy as np
-import speechbrain as sb
-import torch
+if TYPE_CHECKING:
+    import torch
 
 logger = logging.getLogger(__name__)
 
 
 def set_seed(seed: int) -> None:
     """Seed random number generators for reproducibility."""
+    import numpy as np
+    import torch
+
     random.seed(seed)
     np.random.seed(seed)
     torch.manual_seed(seed)
@@ -21,6 +33,40 @@ def set_seed(seed: int) -> None:
     torch.backends.cudnn.benchmark = False
 
 
+def seed_worker(worker_id: int) -> None:
+    """
+    DataLoader ``worker_init_fn``: seed numpy and ``random`` from torch's seed.
+
+    torch gives every worker ``base_seed + worker_id``, where ``base_seed``
+    is drawn from the main process RNG for each loader iterator. Seeding
+    from it keeps runs reproducible without fixing every epoch (or a
+    resumed run) to the same crops.
+    """
+    import torch
+
+    set_seed(torch.initial_seed() % 2**32)
+
+
+def available_cpus() -> int:
+    """CPU cores this process may run on (respects affinity masks and cgroups pinning)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def available_memory_gb() -> float:
+    """Memory the OS reports as available for new processes, in GiB."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024**2
+    except OSError:
+        pass
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024**3
+
+
 def ensure_dir(path: os.PathLike) -> Path:
     """Create a directory if it does not exist."""
     path = Path(path)
@@ -28,24 +74,144 @@ def ensure_dir(path: os.PathLike) -> Path:
     return path
 
 
-def random_crop(sig: torch.Tensor, sr: int, max_dur: float) -> torch.Tensor:
-    """Crop or pad a waveform to a fixed duration."""
+def random_crop(sig: torch.Tensor, sr: int, max_dur: float, pad: bool = True) -> torch.Tensor:
+    """Crop or pad a waveform to a fixed duration.
+
+    With ``pad=False`` shorter signals are returned unchanged, leaving the
+    padding to the batch collation.
+    """
+    import torch
+
     max_len = int(sr * max_dur)
     if sig.shape[-1] > max_len:
         start = torch.randint(0, sig.shape[-1] - max_len + 1, (1,)).item()
         sig = sig[..., start : start + max_len]
-    else:
+    elif pad:
         pad = max_len - sig.shape[-1]
         sig = torch.nn.functional.pad(sig, (0, pad))
     return sig
 
 
+class ReadWindow(NamedTuple):
+    """Source frames to read for one crop, see :func:`crop_read_window`."""
+
+    start: int  # first sample of the crop in the resampled signal
+    frame_offset: int
+    num_frames: int
+    skip: int  # resampled samples to drop before the crop
+
+
+def crop_read_window(
+    num_frames: int, orig_sr: int, sr: int, max_dur: float, margin_s: float = 0.01
+) -> Optional[ReadWindow]:
+    """Pick a :func:`random_crop` window before reading a ``num_frames`` recording.
+
+    The crop start is drawn exactly as :func:`random_crop` draws it on the
+    fully resampled signal. The returned frame range covers the crop plus
+    ``margin_s`` on each side, which is wider than the resampling filter, and
+    starts on a whole resampling period (``orig_sr / gcd`` frames), so
+    resampling only that range reproduces the same samples. Returns ``None``
+    when the recording is no longer than the crop and must be read whole.
+    """
+    import torch
+
+    max_len = int(sr * max_dur)
+    total = math.ceil(num_frames * sr / orig_sr)
+    if total <= max_len:
+        return None
+    start = torch.randint(0, total - max_len + 1, (1,)).item()
+    step = math.gcd(orig_sr, sr)
+    in_period, out_period = orig_sr // step, sr // step
+    margin = math.ceil(margin_s * sr)
+    first = max(0, start - margin) // out_period
+    last = math.ceil((start + max_len + margin) / out_period)
+    frame_offset = first * in_period
+    stop = min(num_frames, last * in_period)
+    return ReadWindow(start, frame_offset, stop - frame_offset, start - first * out_period)
+
+
+def peak_normalize(sig: torch.Tensor) -> torch.Tensor:
+    """Scale each signal (last dimension) to a peak amplitude of one."""
+    import torch
+
+    return sig / torch.clamp(sig.abs().amax(dim=-1, keepdim=True), min=1e-6)
+
+
+def sliding_windows(sig: torch.Tensor, sr: int, win_dur: float, hop_dur: float) -> torch.Tensor:
+    """Split a 1-D waveform into overlapping windows of shape ``[n, win_len]``.
+
+    The last window is aligned with the end of the signal, so the whole
+    recording is covered without padding; signals shorter than one window
+    are returned as a single window of their own length.
+    """
+    import torch
+
+    win_len = int(sr * win_dur)
+    hop_len = max(1, int(sr * hop_dur))
+    if sig.shape[-1] <= win_len:
+        return sig.unsqueeze(0)
+    windows = sig.unfold(0, win_len, hop_len)
+    last_start = (windows.shape[0] - 1) * hop_len
+    if last_start + win_len < sig.shape[-1]:
+        windows = torch.cat([windows, sig[-win_len:].unsqueeze(0)], dim=0)
+    return windows
+
+
+def aggregate_windows(scores: torch.Tensor, log_probs: bool = True) -> torch.Tensor:
+    """Average per-window scores into one recording-level score.
+
+    Log-probabilities are averaged and renormalised, i.e. the normalised
+    geometric mean of the window posteriors.
+    """
+    import torch
+
+    mean = scores.mean(dim=0)
+    if log_probs:
+        mean = torch.log_softmax(mean, dim=-1)
+    return mean
+
+
+def windowed_scores(
+    encode,
+    wavs: torch.Tensor,
+    lens: torch.Tensor,
+    sr: int,
+    win_dur: float,
+    hop_dur: float,
+    log_probs: bool = True,
+) -> torch.Tensor:
+    """Score each padded recording as one batch of sliding windows.
+
+    ``encode`` maps a ``[n, win_len]`` batch and its relative lengths to
+    per-window scores; the windows of every recording are aggregated with
+    :func:`aggregate_windows`.
+    """
+    import torch
+
+    outputs = []
+    for wav, rel_len in zip(wavs, lens):
+        sig = wav[: max(1, int(round(rel_len.item() * wavs.shape[-1])))]
+        windows = peak_normalize(sliding_windows(sig, sr, win_dur, hop_dur))
+        scores = encode(windows, torch.ones(windows.shape[0], device=windows.device))
+        outputs.append(aggregate_windows(scores, log_probs=log_probs))
+    return torch.stack(outputs)
+
+
 def resolve_path(path: str | os.PathLike) -> Path:
     return Path(path).expanduser().resolve()
 
 
+def num_classes(hparams) -> int:
+    """``n_classes``, falling back to ``out_n_neurons`` in hparams saved before the rename."""
+    if "n_classes" in hparams:
+        return hparams["n_classes"]
+    return hparams["out_n_neurons"]
+
+
 def prepare_label_encoder(datasets, save_folder: os.PathLike, output_key: str, expected_len: int):
     """Build and persist a categorical label encoder from a dataset."""
+    import speechbrain as sb
+
     label_encoder = sb.dataio.encoder.CategoricalEncoder()
     lab_enc_file = os.path.join(save_folder, "label_encoder.txt")
     if sb.utils.distributed.if_main_process():